@@ -3,34 +3,56 @@ FastAPI Application for OSM Data Query and Visualization POC
 """
 
 import os
+import asyncio
+import gzip
 import uuid
 import shutil
+import hashlib
+import heapq
+import pickle
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
+from urllib.parse import quote
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
-from fastapi.responses import FileResponse, JSONResponse, HTMLResponse, Response
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, HTMLResponse, Response, ORJSONResponse, StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import aiofiles
+import orjson
+from cachetools import TTLCache
+from shapely.geometry import LineString, Point, box
+from shapely.strtree import STRtree
 
 from api_models import (
-    OSMQueryRequest, OSMDataResponse, ReportResponse, 
+    BoundingBox, OSMQueryRequest, OSMDataResponse, OSMStatsResponse, ReportResponse, 
     VisualizationResponse, APIResponse, ErrorResponse, 
-    HealthResponse, OutputType, FeatureTypeValidator, MACH9_FEATURE_TYPES, AVAILABLE_FEATURE_TYPES, MAIN_FEATURE_KEYS
+    HealthResponse, OutputType, FeatureTypeValidator, MACH9_FEATURE_TYPES, MACH9_FEATURE_TYPES_SET, AVAILABLE_FEATURE_TYPES, MAIN_FEATURE_KEYS
 )
-from osm_query import OSMQuery
+from osm_query import OSMQuery, DEFAULT_FEATURE_TYPES
 from report_generator import OSMReportGenerator, save_json_report
 from visualizer import OSMVisualizer, create_summary_plots
 from mach9_report_generator import Mach9ReportGenerator, save_mach9_json_report
 
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Initialize rate limiter. Counters live in process memory by default; point
+# RATE_LIMIT_STORAGE_URI at Redis (e.g. "redis://localhost:6379/0") so limits
+# are shared across uvicorn workers.
+RATE_LIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_STORAGE_URI", "memory://")
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="moving-window"
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -85,6 +107,7 @@ app = FastAPI(
     * Feature type count limits
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     contact={
@@ -100,27 +123,65 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Allowed CORS origins. A frozenset keeps Starlette's per-request
+# `origin in allow_origins` check O(1) as production domains are added.
+ALLOWED_ORIGINS = frozenset({
+    "http://localhost:3000",  # React dev server
+    "http://localhost:8080",  # Vue dev server
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:8080",
+    # Add your production domains here
+})
+
 # Add CORS middleware with restrictions
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",  # React dev server
-        "http://localhost:8080",  # Vue dev server
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:8080",
-        # Add your production domains here
-    ],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["Content-Type", "Authorization"],
 )
 
+class ResponseCompressionMiddleware(GZipMiddleware):
+    """
+    Gzip large JSON/CSV responses, skipping file downloads.
+    
+    Generated files (PNG plots in particular) are streamed as-is;
+    compressing them again costs CPU for little or no size gain.
+    """
+    
+    EXCLUDED_PREFIXES = ("/download/", "/files/", "/static/")
+    # Static JSON endpoints that serve their own precompressed bodies
+    PRECOMPRESSED_PATHS = frozenset({"/examples", "/feature-types", "/mach9-feature-types", "/main-feature-keys"})
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and (
+            scope["path"].startswith(self.EXCLUDED_PREFIXES) or scope["path"] in self.PRECOMPRESSED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress large responses (/query JSON, /csv-rollup CSV)
+app.add_middleware(ResponseCompressionMiddleware, minimum_size=1024)
+
 # Create output directory
 OUTPUT_DIR = Path("api_outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
+OUTPUT_DIR_RESOLVED = OUTPUT_DIR.resolve()
+
+class SessionFiles(StaticFiles):
+    """StaticFiles that never serves dotfiles (session-internal data such as the osm_data pickle)"""
+    
+    async def get_response(self, path: str, scope):
+        if any(part.startswith('.') for part in path.replace(os.sep, '/').split('/')):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return await super().get_response(path, scope)
+
 
 # Mount static files for serving generated files
-app.mount("/files", StaticFiles(directory=str(OUTPUT_DIR)), name="files")
+app.mount("/files", SessionFiles(directory=str(OUTPUT_DIR)), name="files")
 
 # Mount static files for custom docs
 STATIC_DIR = Path("static")
@@ -132,6 +193,51 @@ MAX_BBOX_SIZE = 0.1  # Maximum bounding box size in degrees
 MAX_FEATURE_TYPES = 20  # Maximum number of feature types per request (increased for Mach9)
 MAX_ELEMENTS_PER_REQUEST = 50000  # Maximum elements to return per request
 
+# Internal nginx location that maps to OUTPUT_DIR (e.g. "/protected-files");
+# when set, downloads are handed off to nginx via X-Accel-Redirect
+X_ACCEL_REDIRECT_PREFIX = os.environ.get("X_ACCEL_REDIRECT_PREFIX", "").rstrip('/')
+
+# Overpass query cache (repeat bbox + feature type queries skip the network)
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_TTL = 3600  # seconds
+_query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+_query_cache_lock = threading.Lock()
+
+# Spatial index over the bboxes of cached Overpass results. A query whose bbox
+# and feature types are covered by a cached result is answered by filtering
+# that result instead of calling Overpass again. The STRtree is immutable, so
+# it is rebuilt lazily after inserts, dropping entries the TTL cache expired.
+# All three are guarded by _query_cache_lock.
+_cache_bbox_index: Dict[str, Tuple[tuple, frozenset]] = {}  # key -> (bbox_tuple, feature types)
+_cache_tree: Optional[STRtree] = None
+_cache_tree_keys: List[str] = []
+
+# Session directory pool: oldest sessions are evicted past MAX_SESSIONS,
+# and a single janitor task removes sessions once they are SESSION_TTL old.
+# The janitor sleeps until the earliest entry in a min-heap of expiries.
+MAX_SESSIONS = 256
+SESSION_TTL = 3600  # seconds
+_sessions: "OrderedDict[str, Path]" = OrderedDict()
+_session_expiries: List[Tuple[float, str]] = []  # min-heap of (expires_at, session_id)
+
+# Every server worker starts its own pools, so the cores are split between
+# the OSM_WORKERS workers (set by start_api.py) instead of each taking all of them
+SERVER_WORKERS = int(os.environ.get("OSM_WORKERS", "1"))
+RENDER_WORKERS = max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+
+# Process pool for CPU-bound report/map rendering
+PROCESS_POOL = ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+
+# Dedicated pool for matplotlib rendering, the heaviest outputs, so a burst
+# of plots cannot occupy every worker in PROCESS_POOL
+PLOT_POOL = ProcessPoolExecutor(max_workers=min(2, RENDER_WORKERS))
+
+# osm_data is written once per session so renderers load it from disk
+# instead of each executor call pickling the full dict again. The file is kept
+# for the session's lifetime. Dotfiles in a session are internal: scan_session_files
+# skips them, /download rejects them and the SessionFiles mount returns 404.
+SESSION_DATA_FILENAME = ".osm_data.pkl"
+
 
 def validate_bounding_box(bbox) -> None:
     """Validate bounding box for security"""
@@ -165,38 +271,390 @@ def validate_feature_types(feature_types: List[str]) -> List[str]:
         )
     
     # Validate against known feature types
-    valid_types = FeatureTypeValidator.validate_feature_types(feature_types)
-    return valid_types
+    return list(_validate_known_feature_types(tuple(feature_types)))
+
+
+@functools.lru_cache(maxsize=256)
+def _validate_known_feature_types(feature_types: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Memoized FeatureTypeValidator lookup; repeat payloads skip the filter"""
+    return tuple(FeatureTypeValidator.validate_feature_types(list(feature_types)))
+
+
+def validate_session_id(session_id: str) -> None:
+    """Validate that a session ID is a canonical UUID string"""
+    try:
+        parsed = uuid.UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid session ID format")
+    
+    # Reject alternative spellings (braces, urn:, no dashes, upper case)
+    if str(parsed) != session_id:
+        raise HTTPException(status_code=400, detail="Invalid session ID format")
+
+
+# Valid output type values, for ordered error messages and O(1) lookups
+VALID_OUTPUTS = [output_type.value for output_type in OutputType]
+VALID_OUTPUTS_SET = frozenset(VALID_OUTPUTS)
 
 
 def validate_outputs(outputs: List[str]) -> List[str]:
     """Validate output types"""
-    valid_outputs = ["report", "plot", "map", "summary", "data", "mach9", "all"]
-    invalid_outputs = [output for output in outputs if output not in valid_outputs]
+    invalid_outputs = [output for output in outputs if output not in VALID_OUTPUTS_SET]
     
     if invalid_outputs:
         raise HTTPException(
             status_code=400, 
-            detail=f"Invalid output types: {invalid_outputs}. Valid types: {valid_outputs}"
+            detail=f"Invalid output types: {invalid_outputs}. Valid types: {VALID_OUTPUTS}"
         )
     
     return outputs
 
 
+def _query_cache_key(bbox_tuple: tuple, feature_types: List[str]) -> str:
+    """Build a stable cache key from a bounding box and feature types"""
+    # None (query defaults) and [] are different queries, so keep them distinct
+    types_key = None if feature_types is None else tuple(sorted(feature_types))
+    key_source = repr((tuple(bbox_tuple), types_key))
+    return hashlib.blake2b(key_source.encode('utf-8')).hexdigest()
+
+
+def _bbox_geometry(bbox_tuple: tuple):
+    """Shapely box for a (min_lat, min_lon, max_lat, max_lon) tuple"""
+    min_lat, min_lon, max_lat, max_lon = bbox_tuple
+    return box(min_lon, min_lat, max_lon, max_lat)
+
+
+def _coords_intersect(coords: List[List[float]], query_box) -> bool:
+    """Whether a [lon, lat] point sequence touches query_box, matching Overpass bbox semantics"""
+    if len(coords) == 1:
+        return query_box.intersects(Point(coords[0]))
+    # Test the outline rather than the filled polygon: Overpass does not
+    # return ways that merely enclose the bbox
+    return query_box.intersects(LineString(coords))
+
+
+def _element_intersects(element: Dict[str, Any], query_box) -> Optional[bool]:
+    """Whether a parsed OSM element lies in query_box, or None if its geometry is unknown"""
+    element_type = element.get('type')
+    
+    if element_type == 'node':
+        if element.get('lat') is None or element.get('lon') is None:
+            return None
+        return query_box.intersects(Point(element['lon'], element['lat']))
+    
+    if element_type == 'way':
+        geometry = element.get('geometry')
+        if not geometry or not geometry.get('coordinates'):
+            return None
+        coords = geometry['coordinates']
+        if geometry['type'] == 'Polygon':
+            coords = coords[0]
+        if not isinstance(coords[0], list):
+            # Unresolved node references
+            return None
+        return _coords_intersect(coords, query_box)
+    
+    if element_type == 'relation':
+        # `out geom` attaches coordinates to node and way members; nested
+        # relation members carry none
+        untestable = False
+        for member in element.get('members', []):
+            if 'lat' in member and 'lon' in member:
+                coords = [[member['lon'], member['lat']]]
+            elif member.get('geometry'):
+                coords = [[point['lon'], point['lat']] for point in member['geometry'] if point]
+            else:
+                untestable = True
+                continue
+            if coords and _coords_intersect(coords, query_box):
+                return True
+        return None if untestable else False
+    
+    return None
+
+
+def _filter_cached_query(osm_data: Dict[str, Any], bbox_tuple: tuple, feature_types: frozenset) -> Optional[Dict[str, Any]]:
+    """
+    Subset a cached result to a smaller bbox and fewer feature types.
+    
+    Returns None if any candidate element cannot be tested, so the caller
+    falls back to querying Overpass.
+    """
+    query_box = _bbox_geometry(bbox_tuple)
+    subset = {}
+    for group in ("nodes", "ways", "relations"):
+        kept = []
+        for element in osm_data.get(group, []):
+            if feature_types.isdisjoint(element.get('tags', {})):
+                continue
+            intersects = _element_intersects(element, query_box)
+            if intersects is None:
+                return None
+            if intersects:
+                kept.append(element)
+        subset[group] = kept
+    subset["total_elements"] = len(subset["nodes"]) + len(subset["ways"]) + len(subset["relations"])
+    return subset
+
+
+def _find_covering_query(bbox_tuple: tuple, feature_types: frozenset) -> Optional[Dict[str, Any]]:
+    """Return a cached result covering bbox_tuple and feature_types. Caller holds _query_cache_lock."""
+    global _cache_tree, _cache_tree_keys
+    
+    if _cache_tree is None and _cache_bbox_index:
+        for key in [key for key in _cache_bbox_index if key not in _query_cache]:
+            del _cache_bbox_index[key]
+        _cache_tree_keys = list(_cache_bbox_index)
+        if _cache_tree_keys:
+            _cache_tree = STRtree([_bbox_geometry(_cache_bbox_index[key][0]) for key in _cache_tree_keys])
+    if _cache_tree is None:
+        return None
+    
+    for index in _cache_tree.query(_bbox_geometry(bbox_tuple), predicate="covered_by"):
+        key = _cache_tree_keys[index]
+        osm_data = _query_cache.get(key)
+        if osm_data is not None and feature_types <= _cache_bbox_index[key][1]:
+            return osm_data
+    return None
+
+
+def cached_query(osm: OSMQuery, bbox_tuple: tuple, feature_types: List[str] = None) -> Dict[str, Any]:
+    """
+    Query OSM data for a bounding box, reusing a cached result when fresh.
+    
+    An exact cache hit is returned as is. Otherwise a cached result whose bbox
+    and feature types cover the request is filtered down to it. Failed queries
+    (results containing an 'error' key) are not cached.
+    """
+    global _cache_tree
+    
+    key = _query_cache_key(bbox_tuple, feature_types)
+    types = frozenset(DEFAULT_FEATURE_TYPES if feature_types is None else feature_types)
+    covering = None
+    with _query_cache_lock:
+        osm_data = _query_cache.get(key)
+        if osm_data is None:
+            covering = _find_covering_query(bbox_tuple, types)
+    if osm_data is not None:
+        return osm_data
+    
+    if covering is not None:
+        osm_data = _filter_cached_query(covering, bbox_tuple, types)
+        if osm_data is not None:
+            with _query_cache_lock:
+                _query_cache[key] = osm_data
+            return osm_data
+    
+    osm_data = osm.query_bounding_box(*bbox_tuple, feature_types=feature_types)
+    if 'error' not in osm_data:
+        with _query_cache_lock:
+            _query_cache[key] = osm_data
+            _cache_bbox_index[key] = (tuple(bbox_tuple), types)
+            _cache_tree = None
+    return osm_data
+
+
+# Output renderers. These run in process pools, so they must stay top-level
+# (picklable) functions. Each receives osm_data either as the live dict or as
+# the path of the session's pickle file, and returns the filenames written to
+# session_dir.
+
+def _save_session_data(osm_data: Dict[str, Any], osm_data_path: str) -> None:
+    """Pickle osm_data for the renderer processes"""
+    with open(osm_data_path, 'wb') as f:
+        pickle.dump(osm_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_session_data(osm_data_source: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return osm_data from a live dict or from a path written by _save_session_data"""
+    if isinstance(osm_data_source, dict):
+        return osm_data_source
+    with open(osm_data_source, 'rb') as f:
+        return pickle.load(f)
+
+
+def _render_report(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Generate the text report"""
+    osm_data = _load_session_data(osm_data_source)
+    generator = OSMReportGenerator()
+    generator.generate_report(osm_data, bbox_tuple, os.path.join(session_dir, "osm_report.txt"))
+    return ["osm_report.txt"]
+
+
+def _render_data(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Export the raw data as JSON"""
+    osm_data = _load_session_data(osm_data_source)
+    save_json_report(osm_data, os.path.join(session_dir, "osm_data.json"))
+    return ["osm_data.json"]
+
+
+def _render_plot(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Generate the matplotlib plot"""
+    osm_data = _load_session_data(osm_data_source)
+    visualizer = OSMVisualizer()
+    if not visualizer.create_matplotlib_plot(osm_data, bbox_tuple, os.path.join(session_dir, "osm_plot.png"), show_plot=False):
+        return []
+    return ["osm_plot.png"]
+
+
+def _render_map(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Generate the interactive folium map"""
+    osm_data = _load_session_data(osm_data_source)
+    visualizer = OSMVisualizer()
+    if not visualizer.create_folium_map(osm_data, bbox_tuple, os.path.join(session_dir, "osm_map.html")):
+        return []
+    return ["osm_map.html"]
+
+
+def _render_summary(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Generate the summary plots"""
+    osm_data = _load_session_data(osm_data_source)
+    if not create_summary_plots(osm_data, session_dir):
+        return []
+    return ["osm_summary.png"]
+
+
+def _render_mach9(osm_data_source: Union[str, Dict[str, Any]], bbox_tuple: tuple, session_dir: str) -> List[str]:
+    """Generate the Mach9 engineering report, JSON data and CSV rollup"""
+    osm_data = _load_session_data(osm_data_source)
+    mach9_generator = Mach9ReportGenerator()
+    mach9_generator.generate_mach9_report(osm_data, bbox_tuple, os.path.join(session_dir, "mach9_engineering_report.txt"))
+    save_mach9_json_report(osm_data, os.path.join(session_dir, "mach9_data.json"))
+    mach9_generator.generate_csv_rollup(osm_data, os.path.join(session_dir, "feature_rollup.csv"))
+    return ["mach9_engineering_report.txt", "mach9_data.json", "feature_rollup.csv"]
+
+
 def get_mach9_feature_types() -> List[str]:
     """Get Mach9-specific feature types for civil engineering and survey work"""
-    return MACH9_FEATURE_TYPES
+    return list(MACH9_FEATURE_TYPES)
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with interactive documentation"""
-    docs_path = STATIC_DIR / "docs.html"
-    if docs_path.exists():
-        with open(docs_path, 'r', encoding='utf-8') as f:
-            return HTMLResponse(content=f.read())
-    else:
-        return HTMLResponse(content="""
+# Static information responses, serialized once at import time
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def static_json(payload: Dict[str, Any]) -> Tuple[bytes, str, bytes, str]:
+    """
+    Serialize a static payload once.
+    
+    Returns the body and its strong ETag, followed by the gzip-compressed body
+    and its own ETag (each representation needs a distinct strong validator).
+    """
+    body = orjson.dumps(payload)
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+    return body, f'"{digest}"', gzip_body, f'"{digest}-gzip"'
+
+
+MAIN_FEATURE_KEYS_JSON = static_json({"main_feature_keys": MAIN_FEATURE_KEYS})
+
+FEATURE_TYPES_JSON = static_json({"feature_types": AVAILABLE_FEATURE_TYPES})
+
+MACH9_FEATURE_TYPES_JSON = static_json({
+    "feature_types": MACH9_FEATURE_TYPES,
+    "description": "Feature types optimized for civil engineering, surveying, and infrastructure analysis",
+    "categories": {
+        "transportation_infrastructure": ["highway", "railway", "aeroway", "waterway", "public_transport"],
+        "physical_barriers": ["barrier", "man_made", "building"],
+        "utility_infrastructure": ["power", "telecom", "amenity"],
+        "survey_features": ["natural", "landuse", "boundary"],
+        "traffic_control": ["traffic_sign", "traffic_calming"],
+        "surface_access": ["surface", "access"]
+    }
+})
+
+
+def static_json_response(request: Request, static: Tuple[bytes, str, bytes, str]) -> Response:
+    """Return pre-serialized JSON with cache headers, or 304 if the client's copy is current"""
+    body, etag, gzip_body, gzip_etag = static
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    if use_gzip:
+        body, etag = gzip_body, gzip_etag
+    headers = {"Cache-Control": STATIC_CACHE_CONTROL, "ETag": etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def register_session(session_id: str, session_dir: Path) -> List[Path]:
+    """
+    Track a new session directory in the LRU session pool and schedule its expiry.
+    
+    Returns the directories of sessions evicted to stay within MAX_SESSIONS.
+    """
+    _sessions[session_id] = session_dir
+    _sessions.move_to_end(session_id)
+    heapq.heappush(_session_expiries, (time.monotonic() + SESSION_TTL, session_id))
+    app.state.session_wake.set()
+    
+    evicted = []
+    while len(_sessions) > MAX_SESSIONS:
+        _, old_dir = _sessions.popitem(last=False)
+        evicted.append(old_dir)
+    return evicted
+
+
+def pop_expired_sessions() -> List[Path]:
+    """Pop due entries from the expiry heap and return the directories still in the pool"""
+    now = time.monotonic()
+    expired = []
+    while _session_expiries and _session_expiries[0][0] <= now:
+        _, session_id = heapq.heappop(_session_expiries)
+        # Sessions already evicted from the pool were deleted at eviction time
+        session_dir = _sessions.pop(session_id, None)
+        if session_dir is not None:
+            expired.append(session_dir)
+    return expired
+
+
+async def remove_session_dirs(session_dirs: List[Path]):
+    """Delete session directories without blocking the event loop"""
+    for session_dir in session_dirs:
+        await asyncio.to_thread(shutil.rmtree, session_dir, ignore_errors=True)
+        print(f"Cleaned up session directory: {session_dir}")
+
+
+async def session_janitor():
+    """Delete session directories as they expire, sleeping until the next expiry"""
+    wake = app.state.session_wake
+    while True:
+        if not _session_expiries:
+            await wake.wait()
+            wake.clear()
+            continue
+        
+        delay = _session_expiries[0][0] - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            continue
+        
+        await remove_session_dirs(pop_expired_sessions())
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Create the shared OSM query client and start the session janitor task"""
+    app.state.osm = OSMQuery()
+    app.state.session_wake = asyncio.Event()
+    app.state.session_janitor = asyncio.create_task(session_janitor())
+
+
+@app.on_event("shutdown")
+def shutdown_background_workers():
+    """Stop the session janitor, OSM client and rendering process pools with the server"""
+    app.state.session_janitor.cancel()
+    app.state.osm.close()
+    PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+    PLOT_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+FALLBACK_ROOT_HTML = """
         <html>
             <head><title>OSM Data Query API</title></head>
             <body>
@@ -205,7 +663,24 @@ async def root():
                 <p>Visit <a href="/static/docs.html">/static/docs.html</a> for interactive documentation.</p>
             </body>
         </html>
-        """)
+        """
+
+
+def load_root_html() -> bytes:
+    """Read the interactive documentation page once, falling back to a stub page"""
+    docs_path = STATIC_DIR / "docs.html"
+    if docs_path.exists():
+        return docs_path.read_bytes()
+    return FALLBACK_ROOT_HTML.encode('utf-8')
+
+
+ROOT_HTML = load_root_html()
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Root endpoint with interactive documentation"""
+    return HTMLResponse(content=ROOT_HTML)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -244,20 +719,75 @@ async def query_osm_data(request: Request, query_request: OSMQueryRequest):
     
     **Rate Limit:** 20 requests per minute
     """
+    return await run_query(request, query_request)
+
+
+@app.post("/query/fast", response_model=OSMDataResponse)
+@limiter.limit("20/minute")
+async def query_osm_data_fast(request: Request):
+    """
+    Query raw OpenStreetMap data, skipping pydantic request validation.
+    
+    Takes the same body as /query and returns the same response. The body is
+    decoded with orjson and the bounding box is range-checked directly, which
+    suits high-volume clients sending well-formed requests. Schema-driven
+    clients should keep using /query.
+    
+    **Rate Limit:** 20 requests per minute
+    """
+    return await run_query(request, parse_fast_query(await request.body()))
+
+
+def parse_fast_query(raw: bytes) -> OSMQueryRequest:
+    """Build an OSMQueryRequest from a raw body with plain checks in place of pydantic validation"""
+    try:
+        payload = orjson.loads(raw)
+        bbox = payload["bbox"]
+        bbox_tuple = (bbox["min_lat"], bbox["min_lon"], bbox["max_lat"], bbox["max_lon"])
+        feature_types = payload.get("feature_types")
+    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object with a bbox")
+    
+    # bool is an int subclass, so compare exact types
+    if not all(type(value) in (int, float) for value in bbox_tuple):
+        raise HTTPException(status_code=422, detail="Bounding box coordinates must be numbers")
+    min_lat, min_lon, max_lat, max_lon = bbox_tuple
+    if not (-90 <= min_lat < max_lat <= 90 and -180 <= min_lon < max_lon <= 180):
+        raise HTTPException(status_code=422, detail="Invalid bounding box")
+    
+    if feature_types is not None and not (
+        isinstance(feature_types, list) and all(isinstance(t, str) for t in feature_types)
+    ):
+        raise HTTPException(status_code=422, detail="feature_types must be a list of strings")
+    
+    # model_construct skips validation; coerce to float as pydantic would so
+    # both routes share query cache keys
+    return OSMQueryRequest.model_construct(
+        bbox=BoundingBox.model_construct(
+            min_lat=float(min_lat), min_lon=float(min_lon),
+            max_lat=float(max_lat), max_lon=float(max_lon)
+        ),
+        feature_types=feature_types,
+        outputs=[OutputType.ALL]
+    )
+
+
+async def run_query(request: Request, query_request: OSMQueryRequest) -> ORJSONResponse:
+    """Run a /query request whose body has already been parsed"""
     try:
         # Security validations
         validate_bounding_box(query_request.bbox)
         feature_types = validate_feature_types(query_request.feature_types)
         validate_outputs(query_request.outputs)
         
-        # Create OSM query instance
-        osm = OSMQuery()
+        # Shared OSM query client (reuses its HTTP connections)
+        osm = request.app.state.osm
         
         # Query OSM data
         bbox_tuple = (query_request.bbox.min_lat, query_request.bbox.min_lon, 
                      query_request.bbox.max_lat, query_request.bbox.max_lon)
         
-        osm_data = osm.query_bounding_box(*bbox_tuple, feature_types=feature_types)
+        osm_data = await asyncio.to_thread(cached_query, osm, bbox_tuple, feature_types)
         
         if 'error' in osm_data:
             raise HTTPException(status_code=500, detail=f"OSM API error: {osm_data['error']}")
@@ -270,24 +800,61 @@ async def query_osm_data(request: Request, query_request: OSMQueryRequest):
                 detail=f"Query returned too many elements ({total_elements}). Maximum: {MAX_ELEMENTS_PER_REQUEST}"
             )
         
-        # Convert to response format
-        response_data = OSMDataResponse(
-            total_elements=total_elements,
-            nodes=[{"id": node.get('id'), "type": node.get('type'), 
-                   "tags": node.get('tags', {}), "geometry": node.get('geometry')} 
-                  for node in osm_data.get('nodes', [])],
-            ways=[{"id": way.get('id'), "type": way.get('type'), 
-                  "tags": way.get('tags', {}), "geometry": way.get('geometry')} 
-                 for way in osm_data.get('ways', [])],
-            relations=[{"id": rel.get('id'), "type": rel.get('type'), 
-                       "tags": rel.get('tags', {}), "geometry": rel.get('geometry')} 
-                      for rel in osm_data.get('relations', [])],
-            bbox=query_request.bbox,
-            feature_types=feature_types,
-            query_time=datetime.now().isoformat()
+        # Elements are produced server-side by OSMQuery, so skip pydantic
+        # validation and let orjson encode the dict directly. The
+        # OSMDataResponse response_model still documents the schema.
+        return ORJSONResponse(content={
+            "total_elements": total_elements,
+            "nodes": osm_data.get('nodes', []),
+            "ways": osm_data.get('ways', []),
+            "relations": osm_data.get('relations', []),
+            "bbox": query_request.bbox.model_dump(),
+            "feature_types": feature_types,
+            "query_time": datetime.now().isoformat()
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/stats", response_model=OSMStatsResponse)
+@limiter.limit("20/minute")
+async def query_osm_stats(request: Request, query_request: OSMQueryRequest):
+    """
+    Count OpenStreetMap elements within a specified geographic area.
+    
+    Returns element counts by type and feature counts by key=value instead of
+    the elements themselves. The Overpass response is counted while it streams
+    in, so no element is ever materialized and the element limit of /query
+    does not apply.
+    
+    **Parameters:**
+    - **bbox**: Geographic bounding box coordinates
+    - **feature_types**: List of OSM feature types to query (optional, defaults to all)
+    
+    **Rate Limit:** 20 requests per minute
+    """
+    try:
+        validate_bounding_box(query_request.bbox)
+        feature_types = validate_feature_types(query_request.feature_types) or list(DEFAULT_FEATURE_TYPES)
+        
+        osm = request.app.state.osm
+        bbox = query_request.bbox
+        stats = await asyncio.to_thread(
+            osm.count_bounding_box, bbox.min_lat, bbox.min_lon, bbox.max_lat, bbox.max_lon, feature_types
         )
         
-        return response_data
+        if 'error' in stats:
+            raise HTTPException(status_code=500, detail=f"OSM API error: {stats['error']}")
+        
+        return ORJSONResponse(content={
+            **stats,
+            "bbox": bbox.model_dump(),
+            "feature_types": feature_types,
+            "query_time": datetime.now().isoformat()
+        })
         
     except HTTPException:
         raise
@@ -297,7 +864,7 @@ async def query_osm_data(request: Request, query_request: OSMQueryRequest):
 
 @app.post("/generate", response_model=APIResponse)
 @limiter.limit("10/minute")
-async def generate_outputs(request: Request, generate_request: OSMQueryRequest, background_tasks: BackgroundTasks):
+async def generate_outputs(request: Request, generate_request: OSMQueryRequest):
     """
     Generate comprehensive OSM data analysis and create multiple output formats.
     
@@ -323,7 +890,7 @@ async def generate_outputs(request: Request, generate_request: OSMQueryRequest,
     
     **File Management:**
     - Files are stored temporarily (1 hour)
-    - Automatic cleanup after expiration
+    - Automatic cleanup after expiration, or earlier once 256 newer sessions exist
     - Download URLs provided in response
     
     **Rate Limit:** 10 requests per minute
@@ -334,105 +901,86 @@ async def generate_outputs(request: Request, generate_request: OSMQueryRequest,
         feature_types = validate_feature_types(generate_request.feature_types)
         validate_outputs(generate_request.outputs)
         
-        # Create unique session directory
-        session_id = str(uuid.uuid4())
-        session_dir = OUTPUT_DIR / session_id
-        session_dir.mkdir(exist_ok=True)
+        outputs = generate_request.outputs if OutputType.ALL not in generate_request.outputs else [
+            OutputType.REPORT, OutputType.PLOT, OutputType.MAP, 
+            OutputType.SUMMARY, OutputType.DATA
+        ]
+        
+        # Mach9 output needs the civil engineering feature types; merge them into
+        # the requested types so a single query serves every output
+        if OutputType.MACH9 in outputs:
+            extra_types = [t for t in feature_types if t not in MACH9_FEATURE_TYPES_SET]
+            feature_types = get_mach9_feature_types() + extra_types
         
         # Query OSM data
-        osm = OSMQuery()
+        osm = request.app.state.osm
         bbox_tuple = (generate_request.bbox.min_lat, generate_request.bbox.min_lon, 
                      generate_request.bbox.max_lat, generate_request.bbox.max_lon)
         
-        osm_data = osm.query_bounding_box(*bbox_tuple, feature_types=feature_types)
+        osm_data = await asyncio.to_thread(cached_query, osm, bbox_tuple, feature_types)
         
         if 'error' in osm_data:
             raise HTTPException(status_code=500, detail=f"OSM API error: {osm_data['error']}")
         
-        if osm_data.get('total_elements', 0) == 0:
+        total_elements = osm_data.get('total_elements', 0)
+        if total_elements == 0:
             raise HTTPException(status_code=404, detail="No data found in the specified bounding box")
         
         # Check if response is too large
-        total_elements = osm_data.get('total_elements', 0)
         if total_elements > MAX_ELEMENTS_PER_REQUEST:
             raise HTTPException(
                 status_code=413, 
                 detail=f"Query returned too many elements ({total_elements}). Maximum: {MAX_ELEMENTS_PER_REQUEST}"
             )
         
+        # Create the session directory only once there is data to render
+        session_id = str(uuid.uuid4())
+        session_dir = OUTPUT_DIR / session_id
+        session_dir.mkdir(exist_ok=True)
+        
+        # Register the session; evict the oldest ones once the pool is full
+        await remove_session_dirs(register_session(session_id, session_dir))
+        
         # Generate requested outputs
         generated_files = []
-        outputs = generate_request.outputs if OutputType.ALL not in generate_request.outputs else [
-            OutputType.REPORT, OutputType.PLOT, OutputType.MAP, 
-            OutputType.SUMMARY, OutputType.DATA
+        
+        # Render the requested outputs concurrently in the process pool
+        renderers = [
+            (OutputType.REPORT, _render_report, PROCESS_POOL),
+            (OutputType.DATA, _render_data, PROCESS_POOL),
+            (OutputType.PLOT, _render_plot, PLOT_POOL),
+            (OutputType.MAP, _render_map, PROCESS_POOL),
+            (OutputType.SUMMARY, _render_summary, PLOT_POOL),
+            (OutputType.MACH9, _render_mach9, PROCESS_POOL),
         ]
+        requested = [renderer for renderer in renderers if renderer[0] in outputs]
         
-        # Handle Mach9 output - automatically set feature types for civil engineering
-        if OutputType.MACH9 in outputs:
-            # Override feature types with Mach9-specific ones
-            feature_types = get_mach9_feature_types()
-            # Re-query with Mach9 feature types
-            osm_data = osm.query_bounding_box(*bbox_tuple, feature_types=feature_types)
-            if 'error' in osm_data:
-                raise HTTPException(status_code=500, detail=f"OSM API error: {osm_data['error']}")
-            total_elements = osm_data.get('total_elements', 0)
-            if total_elements > MAX_ELEMENTS_PER_REQUEST:
-                raise HTTPException(
-                    status_code=413, 
-                    detail=f"Query returned too many elements ({total_elements}). Maximum: {MAX_ELEMENTS_PER_REQUEST}"
-                )
-        
-        # Generate text report
-        if OutputType.REPORT in outputs:
-            generator = OSMReportGenerator()
-            report_file = session_dir / "osm_report.txt"
-            report = generator.generate_report(osm_data, bbox_tuple, str(report_file))
-            generated_files.append(f"/files/{session_id}/osm_report.txt")
-        
-        # Generate raw data JSON
-        if OutputType.DATA in outputs:
-            json_file = session_dir / "osm_data.json"
-            save_json_report(osm_data, str(json_file))
-            generated_files.append(f"/files/{session_id}/osm_data.json")
-        
-        # Generate matplotlib plot
-        if OutputType.PLOT in outputs:
-            visualizer = OSMVisualizer()
-            plot_file = session_dir / "osm_plot.png"
-            visualizer.create_matplotlib_plot(osm_data, bbox_tuple, str(plot_file), show_plot=False)
-            generated_files.append(f"/files/{session_id}/osm_plot.png")
-        
-        # Generate interactive map
-        if OutputType.MAP in outputs:
-            visualizer = OSMVisualizer()
-            map_file = session_dir / "osm_map.html"
-            visualizer.create_folium_map(osm_data, bbox_tuple, str(map_file))
-            generated_files.append(f"/files/{session_id}/osm_map.html")
-        
-        # Generate summary plots
-        if OutputType.SUMMARY in outputs:
-            create_summary_plots(osm_data, str(session_dir))
-            generated_files.append(f"/files/{session_id}/osm_summary.png")
-        
-        # Generate Mach9 engineering report
-        if OutputType.MACH9 in outputs:
-            mach9_generator = Mach9ReportGenerator()
-            mach9_report_file = session_dir / "mach9_engineering_report.txt"
-            mach9_generator.generate_mach9_report(osm_data, bbox_tuple, str(mach9_report_file))
-            generated_files.append(f"/files/{session_id}/mach9_engineering_report.txt")
-            
-            # Also generate Mach9 JSON data
-            mach9_json_file = session_dir / "mach9_data.json"
-            save_mach9_json_report(osm_data, str(mach9_json_file))
-            generated_files.append(f"/files/{session_id}/mach9_data.json")
-            
-            # Generate CSV rollup
-            csv_rollup_file = session_dir / "feature_rollup.csv"
-            mach9_generator.generate_csv_rollup(osm_data, str(csv_rollup_file))
-            generated_files.append(f"/files/{session_id}/feature_rollup.csv")
-        
-        # Schedule cleanup task (delete files after 1 hour)
-        background_tasks.add_task(cleanup_session_files, session_dir)
+        # Several renderers share one pickle on disk; a single renderer gets the
+        # live dict, which the executor pickles exactly once anyway
+        if len(requested) > 1:
+            osm_data_source = str(session_dir / SESSION_DATA_FILENAME)
+            await asyncio.to_thread(_save_session_data, osm_data, osm_data_source)
+        else:
+            osm_data_source = osm_data
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, renderer, osm_data_source, bbox_tuple, str(session_dir))
+              for _, renderer, pool in requested),
+            return_exceptions=True
+        )
+        
+        # A failed output does not discard the ones that succeeded
+        failed_outputs = []
+        for (output_type, _, _), result in zip(requested, results):
+            if isinstance(result, Exception):
+                print(f"Error generating {output_type.value} output: {result}")
+                failed_outputs.append(output_type.value)
+            else:
+                generated_files.extend(f"/files/{session_id}/{name}" for name in result)
+        
+        if failed_outputs and not generated_files:
+            raise HTTPException(status_code=500, detail=f"Failed to generate outputs: {failed_outputs}")
         
         return APIResponse(
             success=True,
@@ -440,8 +988,9 @@ async def generate_outputs(request: Request, generate_request: OSMQueryRequest,
             data={
                 "session_id": session_id,
                 "total_elements": total_elements,
-                "bbox": generate_request.bbox.dict(),
-                "feature_types": feature_types
+                "bbox": generate_request.bbox.model_dump(),
+                "feature_types": feature_types,
+                "failed_outputs": failed_outputs
             },
             files=generated_files
         )
@@ -452,56 +1001,82 @@ async def generate_outputs(request: Request, generate_request: OSMQueryRequest,
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# File I/O strategy: generated session files can be large (maps, CSVs, JSON
+# exports), so downloads go through FileResponse, which streams them in chunks
+# off the event loop. Small static files such as docs.html stay on plain
+# synchronous reads (and are cached in memory, see root()): for small files
+# already in the page cache, sync reads are measurably faster than a thread hop.
+def content_disposition(filename: str) -> str:
+    """Attachment header with an ASCII fallback and the RFC 5987 UTF-8 filename*"""
+    fallback = filename.encode('ascii', 'replace').decode('ascii').replace('"', '_')
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
 @app.get("/download/{session_id}/{filename}")
 @limiter.limit("30/minute")
 async def download_file(request: Request, session_id: str, filename: str):
     """
     Download a specific file from a session
     """
-    # Validate session_id format (basic UUID check)
-    if len(session_id) != 36 or session_id.count('-') != 4:
-        raise HTTPException(status_code=400, detail="Invalid session ID format")
+    validate_session_id(session_id)
     
-    # Validate filename (prevent directory traversal)
-    if '..' in filename or '/' in filename or '\\' in filename:
+    # Validate filename (prevent directory traversal and internal dotfiles)
+    if filename.startswith('.') or '/' in filename or '\\' in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = OUTPUT_DIR / session_id / filename
+    file_path = (OUTPUT_DIR / session_id / filename).resolve()
+    if file_path.parent != OUTPUT_DIR_RESOLVED / session_id:
+        raise HTTPException(status_code=400, detail="Invalid filename")
     
-    if not file_path.exists():
+    if not await asyncio.to_thread(file_path.is_file):
         raise HTTPException(status_code=404, detail="File not found")
     
+    # Behind nginx, let the proxy stream the file itself (sendfile)
+    if X_ACCEL_REDIRECT_PREFIX:
+        return Response(
+            media_type='application/octet-stream',
+            headers={
+                "X-Accel-Redirect": f"{X_ACCEL_REDIRECT_PREFIX}/{session_id}/{quote(filename)}",
+                "Content-Disposition": content_disposition(filename)
+            }
+        )
+    
+    # FileResponse streams the file in chunks and sets Content-Length,
+    # Last-Modified and ETag
     return FileResponse(
-        path=str(file_path),
-        filename=filename,
-        media_type='application/octet-stream'
+        file_path,
+        media_type='application/octet-stream',
+        headers={"Content-Disposition": content_disposition(filename)}
     )
 
 
+def scan_session_files(session_id: str) -> List[Dict[str, Any]]:
+    """List a session's downloadable files in one directory scan (DirEntry caches is_file)"""
+    with os.scandir(OUTPUT_DIR / session_id) as entries:
+        return [
+            {
+                "filename": entry.name,
+                "size": entry.stat().st_size,
+                "download_url": f"/files/{session_id}/{entry.name}"
+            }
+            for entry in entries
+            if not entry.name.startswith('.') and entry.is_file()
+        ]
+
+
 @app.get("/session/{session_id}/files")
 @limiter.limit("30/minute")
 async def list_session_files(request: Request, session_id: str):
     """
     List all files in a session
     """
-    # Validate session_id format
-    if len(session_id) != 36 or session_id.count('-') != 4:
-        raise HTTPException(status_code=400, detail="Invalid session ID format")
+    validate_session_id(session_id)
     
-    session_dir = OUTPUT_DIR / session_id
-    
-    if not session_dir.exists():
+    try:
+        files = await asyncio.to_thread(scan_session_files, session_id)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    files = []
-    for file_path in session_dir.iterdir():
-        if file_path.is_file():
-            files.append({
-                "filename": file_path.name,
-                "size": file_path.stat().st_size,
-                "download_url": f"/files/{session_id}/{file_path.name}"
-            })
-    
     return {"session_id": session_id, "files": files}
 
 
@@ -529,7 +1104,7 @@ async def get_main_feature_keys(request: Request):
     
     **Rate Limit:** 60 requests per minute
     """
-    return {"main_feature_keys": MAIN_FEATURE_KEYS}
+    return static_json_response(request, MAIN_FEATURE_KEYS_JSON)
 
 
 @app.get("/feature-types")
@@ -556,7 +1131,7 @@ async def get_available_feature_types(request: Request):
     
     **Rate Limit:** 60 requests per minute
     """
-    return {"feature_types": AVAILABLE_FEATURE_TYPES}
+    return static_json_response(request, FEATURE_TYPES_JSON)
 
 
 @app.get("/mach9-feature-types")
@@ -596,18 +1171,7 @@ async def get_mach9_feature_types_endpoint(request: Request):
     
     **Rate Limit:** 60 requests per minute
     """
-    return {
-        "feature_types": get_mach9_feature_types(),
-        "description": "Feature types optimized for civil engineering, surveying, and infrastructure analysis",
-        "categories": {
-            "transportation_infrastructure": ["highway", "railway", "aeroway", "waterway", "public_transport"],
-            "physical_barriers": ["barrier", "man_made", "building"],
-            "utility_infrastructure": ["power", "telecom", "amenity"],
-            "survey_features": ["natural", "landuse", "boundary"],
-            "traffic_control": ["traffic_sign", "traffic_calming"],
-            "surface_access": ["surface", "access"]
-        }
-    }
+    return static_json_response(request, MACH9_FEATURE_TYPES_JSON)
 
 
 @app.post("/csv-rollup")
@@ -650,8 +1214,8 @@ async def generate_csv_rollup(request: Request, query_request: OSMQueryRequest):
         )
         
         # Query OSM data
-        osm = OSMQuery()
-        osm_data = osm.query_bounding_box(*bbox_tuple, feature_types=query_request.feature_types)
+        osm = request.app.state.osm
+        osm_data = await asyncio.to_thread(cached_query, osm, bbox_tuple, query_request.feature_types)
         
         if 'error' in osm_data:
             raise HTTPException(status_code=500, detail=f"OSM API error: {osm_data['error']}")
@@ -663,12 +1227,12 @@ async def generate_csv_rollup(request: Request, query_request: OSMQueryRequest):
                 detail=f"Query returned too many elements ({total_elements}). Maximum: {MAX_ELEMENTS_PER_REQUEST}"
             )
         
-        # Generate CSV rollup
+        # Stream the CSV rollup row by row; Starlette iterates the sync
+        # generator in its threadpool, so the event loop is not blocked
         mach9_generator = Mach9ReportGenerator()
-        csv_content = mach9_generator.generate_csv_rollup(osm_data)
         
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            mach9_generator.iter_csv_rollup(osm_data),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=osm_feature_rollup.csv"}
         )
@@ -679,118 +1243,93 @@ async def generate_csv_rollup(request: Request, query_request: OSMQueryRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@app.get("/examples")
-@limiter.limit("60/minute")
-async def get_example_requests(request: Request):
-    """
-    Get example requests for different use cases
-    """
-    examples = {
-        "london_eye": {
-            "description": "London Eye, UK - All features",
-            "request": {
-                "bbox": {
-                    "min_lat": 51.5033,
-                    "min_lon": -0.1196,
-                    "max_lat": 51.5043,
-                    "max_lon": -0.1186
-                },
-                "feature_types": None,
-                "outputs": ["report", "plot", "map"]
-            }
-        },
-        "comprehensive_urban": {
-            "description": "Comprehensive urban features - buildings, amenities, transportation, utilities",
-            "request": {
-                "bbox": {
-                    "min_lat": 51.5033,
-                    "min_lon": -0.1196,
-                    "max_lat": 51.5043,
-                    "max_lon": -0.1186
-                },
-                "feature_types": [
-                    "highway", "building", "amenity", "shop", "tourism", 
-                    "leisure", "natural", "landuse", "power", "telecom",
-                    "barrier", "man_made", "railway", "waterway", "place",
-                    "office", "craft", "healthcare", "sport", "historic"
-                ],
-                "outputs": ["report", "plot", "map"]
-            }
-        },
-        "transportation_infrastructure": {
-            "description": "Transportation and infrastructure features",
-            "request": {
-                "bbox": {
-                    "min_lat": 51.5033,
-                    "min_lon": -0.1196,
-                    "max_lat": 51.5043,
-                    "max_lon": -0.1186
-                },
-                "feature_types": [
-                    "highway", "railway", "public_transport", "aeroway", 
-                    "waterway", "barrier", "man_made", "power", "telecom",
-                    "traffic_sign", "traffic_calming", "surface", "access"
-                ],
-                "outputs": ["plot", "map", "data"]
-            }
-        },
-        "commercial_amenities": {
-            "description": "Commercial and amenity features",
-            "request": {
-                "bbox": {
-                    "min_lat": 51.5033,
-                    "min_lon": -0.1196,
-                    "max_lat": 51.5043,
-                    "max_lon": -0.1186
-                },
-                "feature_types": [
-                    "building", "amenity", "shop", "tourism", "leisure", 
-                    "sport", "healthcare", "office", "craft", "place",
-                    "historic", "heritage", "emergency", "military"
-                ],
-                "outputs": ["report", "data"]
-            }
-        },
-        "mach9_engineering": {
-            "description": "Mach9 Engineering Report - Comprehensive civil engineering and survey features",
-            "request": {
-                "bbox": {
-                    "min_lat": 51.5033,
-                    "min_lon": -0.1196,
-                    "max_lat": 51.5043,
-                    "max_lon": -0.1186
-                },
-                "feature_types": [
-                    "highway", "railway", "aeroway", "waterway", "public_transport",
-                    "barrier", "man_made", "building", "power", "telecom", "amenity",
-                    "natural", "landuse", "boundary", "traffic_sign", "traffic_calming",
-                    "surface", "access", "kerb", "tunnel", "bridge", "embankment",
-                    "retaining_wall", "cycle_barrier", "survey_point", "benchmark",
-                    "marker", "culvert", "drain", "ditch", "street_lamp", "traffic_signals",
-                    "bollard", "fence", "wall", "gate", "manhole", "utility_pole",
-                    "street_cabinet", "fire_hydrant", "pipeline", "tower", "mast",
-                    "antenna", "substation", "generator", "transformer", "noise_barrier",
-                    "sound_barrier", "guard_rail", "crash_barrier", "steps", "ramp",
-                    "elevator", "escalator", "handrail", "railing"
-                ],
-                "outputs": ["mach9"]
-            }
+# Example requests served by /examples. All examples use the London Eye bbox.
+EXAMPLE_BBOX = {
+    "min_lat": 51.5033,
+    "min_lon": -0.1196,
+    "max_lat": 51.5043,
+    "max_lon": -0.1186
+}
+
+EXAMPLE_REQUESTS = {
+    "london_eye": {
+        "description": "London Eye, UK - All features",
+        "request": {
+            "bbox": EXAMPLE_BBOX,
+            "feature_types": None,
+            "outputs": ["report", "plot", "map"]
+        }
+    },
+    "comprehensive_urban": {
+        "description": "Comprehensive urban features - buildings, amenities, transportation, utilities",
+        "request": {
+            "bbox": EXAMPLE_BBOX,
+            "feature_types": [
+                "highway", "building", "amenity", "shop", "tourism", 
+                "leisure", "natural", "landuse", "power", "telecom",
+                "barrier", "man_made", "railway", "waterway", "place",
+                "office", "craft", "healthcare", "sport", "historic"
+            ],
+            "outputs": ["report", "plot", "map"]
+        }
+    },
+    "transportation_infrastructure": {
+        "description": "Transportation and infrastructure features",
+        "request": {
+            "bbox": EXAMPLE_BBOX,
+            "feature_types": [
+                "highway", "railway", "public_transport", "aeroway", 
+                "waterway", "barrier", "man_made", "power", "telecom",
+                "traffic_sign", "traffic_calming", "surface", "access"
+            ],
+            "outputs": ["plot", "map", "data"]
+        }
+    },
+    "commercial_amenities": {
+        "description": "Commercial and amenity features",
+        "request": {
+            "bbox": EXAMPLE_BBOX,
+            "feature_types": [
+                "building", "amenity", "shop", "tourism", "leisure", 
+                "sport", "healthcare", "office", "craft", "place",
+                "historic", "heritage", "emergency", "military"
+            ],
+            "outputs": ["report", "data"]
+        }
+    },
+    "mach9_engineering": {
+        "description": "Mach9 Engineering Report - Comprehensive civil engineering and survey features",
+        "request": {
+            "bbox": EXAMPLE_BBOX,
+            "feature_types": [
+                "highway", "railway", "aeroway", "waterway", "public_transport",
+                "barrier", "man_made", "building", "power", "telecom", "amenity",
+                "natural", "landuse", "boundary", "traffic_sign", "traffic_calming",
+                "surface", "access", "kerb", "tunnel", "bridge", "embankment",
+                "retaining_wall", "cycle_barrier", "survey_point", "benchmark",
+                "marker", "culvert", "drain", "ditch", "street_lamp", "traffic_signals",
+                "bollard", "fence", "wall", "gate", "manhole", "utility_pole",
+                "street_cabinet", "fire_hydrant", "pipeline", "tower", "mast",
+                "antenna", "substation", "generator", "transformer", "noise_barrier",
+                "sound_barrier", "guard_rail", "crash_barrier", "steps", "ramp",
+                "elevator", "escalator", "handrail", "railing"
+            ],
+            "outputs": ["mach9"]
         }
     }
-    
-    return {"examples": examples}
+}
+
 
+EXAMPLES_JSON = static_json({"examples": EXAMPLE_REQUESTS})
 
-async def cleanup_session_files(session_dir: Path):
+
+@app.get("/examples")
+@limiter.limit("60/minute")
+async def get_example_requests(request: Request):
     """
-    Background task to clean up session files after 1 hour
+    Get example requests for different use cases
     """
-    import asyncio
-    await asyncio.sleep(3600)  # Wait 1 hour
-    
-    if session_dir.exists():
-        shutil.rmtree(session_dir)
-        print(f"Cleaned up session directory: {session_dir}")
+    return static_json_response(request, EXAMPLES_JSON)
 
 
 if __name__ == "__main__":
@@ -4,36 +4,61 @@ API Client for OSM POC FastAPI
 Demonstrates how to use the API endpoints
 """
 
+import asyncio
 import requests
+import httpx
 import json
+import orjson
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, List
 
 
+# Shared by every OSMAPIClient: a keep-alive pool large enough for threaded
+# callers, with capped backoff retries (honoring Retry-After) for rate limiting
+# and transient gateway errors
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.25,
+        backoff_max=10,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True
+    )
+)
+
+
 class OSMAPIClient:
     """Client for OSM POC API"""
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        self.session.mount("http://", HTTP_ADAPTER)
+        self.session.mount("https://", HTTP_ADAPTER)
+        self.session.headers["Accept-Encoding"] = "gzip"
     
     def health_check(self) -> Dict[str, Any]:
         """Check API health"""
         response = self.session.get(f"{self.base_url}/health")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def get_feature_types(self) -> List[str]:
         """Get available feature types"""
         response = self.session.get(f"{self.base_url}/feature-types")
         response.raise_for_status()
-        return response.json()["feature_types"]
+        return orjson.loads(response.content)["feature_types"]
     
     def get_examples(self) -> Dict[str, Any]:
         """Get example requests"""
         response = self.session.get(f"{self.base_url}/examples")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def query_osm_data(self, bbox: Dict[str, float], feature_types: List[str] = None) -> Dict[str, Any]:
         """
@@ -51,7 +76,7 @@ class OSMAPIClient:
         
         response = self.session.post(f"{self.base_url}/query", json=payload)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def generate_outputs(self, bbox: Dict[str, float], feature_types: List[str] = None, 
                         outputs: List[str] = None) -> Dict[str, Any]:
@@ -74,7 +99,7 @@ class OSMAPIClient:
         
         response = self.session.post(f"{self.base_url}/generate", json=payload)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def download_file(self, session_id: str, filename: str, save_path: str = None) -> str:
         """
@@ -88,11 +113,11 @@ class OSMAPIClient:
         if save_path is None:
             save_path = filename
         
-        response = self.session.get(f"{self.base_url}/download/{session_id}/{filename}")
-        response.raise_for_status()
-        
-        with open(save_path, 'wb') as f:
-            f.write(response.content)
+        with self.session.get(f"{self.base_url}/download/{session_id}/{filename}", stream=True) as response:
+            response.raise_for_status()
+            with open(save_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
         
         return save_path
     
@@ -100,7 +125,102 @@ class OSMAPIClient:
         """List all files in a session"""
         response = self.session.get(f"{self.base_url}/session/{session_id}/files")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+
+class AsyncOSMAPIClient:
+    """
+    Async client for OSM POC API
+    
+    Holds one pooled HTTP/2 connection set for its lifetime, so independent
+    requests can run concurrently with asyncio.gather. Use as an async
+    context manager:
+    
+        async with AsyncOSMAPIClient() as client:
+            await client.health_check()
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:8000"):
+        self.base_url = base_url.rstrip('/')
+        self._client = None
+    
+    async def __aenter__(self) -> "AsyncOSMAPIClient":
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(120.0)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._client.aclose()
+        self._client = None
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Check API health"""
+        response = await self._client.get("/health")
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def get_feature_types(self) -> List[str]:
+        """Get available feature types"""
+        response = await self._client.get("/feature-types")
+        response.raise_for_status()
+        return orjson.loads(response.content)["feature_types"]
+    
+    async def get_examples(self) -> Dict[str, Any]:
+        """Get example requests"""
+        response = await self._client.get("/examples")
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def query_osm_data(self, bbox: Dict[str, float], feature_types: List[str] = None) -> Dict[str, Any]:
+        """Query OSM data without generating files"""
+        payload = {
+            "bbox": bbox,
+            "feature_types": feature_types,
+            "outputs": ["data"]
+        }
+        
+        response = await self._client.post("/query", json=payload)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def generate_outputs(self, bbox: Dict[str, float], feature_types: List[str] = None, 
+                               outputs: List[str] = None) -> Dict[str, Any]:
+        """Generate OSM data and create outputs"""
+        if outputs is None:
+            outputs = ["report", "plot", "map"]
+        
+        payload = {
+            "bbox": bbox,
+            "feature_types": feature_types,
+            "outputs": outputs
+        }
+        
+        response = await self._client.post("/generate", json=payload)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def download_file(self, session_id: str, filename: str, save_path: str = None) -> str:
+        """Download a file from a session, streaming it to disk in chunks"""
+        if save_path is None:
+            save_path = filename
+        
+        async with self._client.stream("GET", f"/download/{session_id}/{filename}") as response:
+            response.raise_for_status()
+            with open(save_path, 'wb') as f:
+                async for chunk in response.aiter_bytes(65536):
+                    f.write(chunk)
+        
+        return save_path
+    
+    async def list_session_files(self, session_id: str) -> Dict[str, Any]:
+        """List all files in a session"""
+        response = await self._client.get(f"/session/{session_id}/files")
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
 
 def demo_api_usage():
@@ -187,8 +307,11 @@ def demo_api_usage():
 
 def test_specific_endpoints():
     """Test specific API endpoints"""
-    client = OSMAPIClient()
-    
+    asyncio.run(_test_specific_endpoints())
+
+
+async def _test_specific_endpoints():
+    """Run the endpoint test cases concurrently"""
     print("\nTesting Specific Endpoints")
     print("-" * 30)
     
@@ -208,18 +331,20 @@ def test_specific_endpoints():
         }
     ]
     
-    for test_case in test_cases:
+    async with AsyncOSMAPIClient() as client:
+        results = await asyncio.gather(
+            *(client.generate_outputs(test_case['bbox'], test_case['features'], test_case['outputs'])
+              for test_case in test_cases),
+            return_exceptions=True
+        )
+    
+    for test_case, result in zip(test_cases, results):
         print(f"\nTesting: {test_case['name']}")
-        try:
-            result = client.generate_outputs(
-                test_case['bbox'],
-                test_case['features'],
-                test_case['outputs']
-            )
+        if isinstance(result, Exception):
+            print(f"  ✗ Failed: {result}")
+        else:
             print(f"  ✓ Generated {len(result['files'])} files")
             print(f"  ✓ Session: {result['data']['session_id']}")
-        except Exception as e:
-            print(f"  ✗ Failed: {e}")
 
 
 if __name__ == "__main__":
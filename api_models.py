@@ -2,7 +2,7 @@
 API Models and Schemas for OSM POC FastAPI
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import List, Optional, Dict, Any, Literal
 from enum import Enum
 
@@ -36,39 +36,41 @@ class BoundingBox(BaseModel):
         ge=-90, 
         le=90, 
         description="Minimum latitude (southern boundary)",
-        example=51.5033
+        examples=[51.5033]
     )
     min_lon: float = Field(
         ..., 
         ge=-180, 
         le=180, 
         description="Minimum longitude (western boundary)",
-        example=-0.1196
+        examples=[-0.1196]
     )
     max_lat: float = Field(
         ..., 
         ge=-90, 
         le=90, 
         description="Maximum latitude (northern boundary)",
-        example=51.5043
+        examples=[51.5043]
     )
     max_lon: float = Field(
         ..., 
         ge=-180, 
         le=180, 
         description="Maximum longitude (eastern boundary)",
-        example=-0.1186
+        examples=[-0.1186]
     )
     
-    @validator('max_lat')
-    def max_lat_must_be_greater_than_min_lat(cls, v, values):
-        if 'min_lat' in values and v <= values['min_lat']:
+    @field_validator('max_lat')
+    @classmethod
+    def max_lat_must_be_greater_than_min_lat(cls, v: float, info: ValidationInfo) -> float:
+        if 'min_lat' in info.data and v <= info.data['min_lat']:
             raise ValueError('max_lat must be greater than min_lat')
         return v
     
-    @validator('max_lon')
-    def max_lon_must_be_greater_than_min_lon(cls, v, values):
-        if 'min_lon' in values and v <= values['min_lon']:
+    @field_validator('max_lon')
+    @classmethod
+    def max_lon_must_be_greater_than_min_lon(cls, v: float, info: ValidationInfo) -> float:
+        if 'min_lon' in info.data and v <= info.data['min_lon']:
             raise ValueError('max_lon must be greater than min_lon')
         return v
 
@@ -97,16 +99,16 @@ class OSMQueryRequest(BaseModel):
     feature_types: Optional[List[str]] = Field(
         default=None,
         description="List of OSM feature types to query. If None, queries all available features. Available types include: highway, building, amenity, shop, tourism, leisure, natural, landuse, power, telecom, barrier, man_made, railway, waterway, place, office, craft, healthcare, sport, historic, heritage, emergency, military, and many more. See /feature-types endpoint for complete list.",
-        example=["highway", "building", "amenity", "shop", "tourism", "leisure", "natural", "landuse", "power", "telecom", "barrier", "man_made", "railway", "waterway", "place"]
+        examples=[["highway", "building", "amenity", "shop", "tourism", "leisure", "natural", "landuse", "power", "telecom", "barrier", "man_made", "railway", "waterway", "place"]]
     )
     outputs: List[OutputType] = Field(
         default=[OutputType.ALL],
         description="List of output types to generate. Use 'all' to generate all available outputs.",
-        example=["report", "plot", "map"]
+        examples=[["report", "plot", "map"]]
     )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "bbox": {
                     "min_lat": 51.5033,
@@ -122,10 +124,20 @@ class OSMQueryRequest(BaseModel):
                 "outputs": ["report", "plot", "map"]
             }
         }
+    )
 
 
 class OSMElement(BaseModel):
-    """Individual OSM element"""
+    """
+    Individual OSM element.
+    
+    Elements may also carry type-specific fields from the parser:
+    lat/lon on nodes, nodes on ways, members on relations. Nodes have
+    no geometry; their lat/lon is the point.
+    
+    Documents the /query response schema only; the endpoint serializes the
+    parsed element dicts directly and never builds one model per element.
+    """
     id: int
     type: str
     tags: Dict[str, str] = {}
@@ -145,7 +157,7 @@ class OSMDataResponse(BaseModel):
     - ways: Linear and polygonal features (e.g., roads, building outlines)
     - relations: Complex features (e.g., bus routes, administrative boundaries)
     """
-    total_elements: int = Field(..., description="Total number of OSM elements found", example=1250)
+    total_elements: int = Field(..., description="Total number of OSM elements found", examples=[1250])
     nodes: List[OSMElement] = Field(..., description="List of OSM node elements")
     ways: List[OSMElement] = Field(..., description="List of OSM way elements")
     relations: List[OSMElement] = Field(..., description="List of OSM relation elements")
@@ -154,6 +166,16 @@ class OSMDataResponse(BaseModel):
     query_time: str = Field(..., description="ISO timestamp when the query was executed")
 
 
+class OSMStatsResponse(BaseModel):
+    """Response model for element and feature counts without the elements themselves"""
+    total_elements: int = Field(..., description="Total number of OSM elements found", examples=[1250])
+    element_types: Dict[str, int] = Field(..., description="Element counts by OSM type (node, way, relation)")
+    feature_counts: Dict[str, int] = Field(..., description="Elements per key=value of their first primary tag (as in the text report), most common first")
+    bbox: BoundingBox = Field(..., description="The bounding box that was queried")
+    feature_types: List[str] = Field(..., description="Feature types that were queried")
+    query_time: str = Field(..., description="ISO timestamp when the query was executed")
+
+
 class ReportResponse(BaseModel):
     """Response model for text report"""
     report_text: str
@@ -229,8 +251,9 @@ MAIN_FEATURE_KEYS = [
     "route", "traffic_sign", "traffic_calming", "surface", "access"
 ]
 
-# Available feature types for validation - comprehensive OSM feature types
-AVAILABLE_FEATURE_TYPES = [
+# Available feature types for validation - comprehensive OSM feature types.
+# This tuple is the canonical list; the Mach9 list below is derived from it.
+AVAILABLE_FEATURE_TYPES = (
     # Transportation
     "highway", "railway", "aeroway", "waterway", "aerialway", "public_transport",
     
@@ -265,10 +288,15 @@ AVAILABLE_FEATURE_TYPES = [
     "route", "traffic_sign", "traffic_calming", "surface", "access",
     "addr", "name", "ref", "operator", "brand", "website", "phone",
     "opening_hours", "fee", "wheelchair", "smoking", "wifi"
-]
+)
 
-# Mach9 Engineering & Survey Feature Types - focused on civil engineering
-MACH9_FEATURE_TYPES = [
+# Set view of the available feature types for O(1) validation lookups
+AVAILABLE_FEATURE_TYPES_SET = frozenset(AVAILABLE_FEATURE_TYPES)
+
+# Mach9 Engineering & Survey Feature Types - focused on civil engineering.
+# Defined as a membership mask over AVAILABLE_FEATURE_TYPES; use the set for
+# "is this a Mach9 type?" checks.
+MACH9_FEATURE_TYPES_SET = frozenset({
     # Transportation Infrastructure
     "highway", "railway", "aeroway", "waterway", "public_transport",
     
@@ -298,7 +326,11 @@ MACH9_FEATURE_TYPES = [
     
     # Drainage and Inlet Features
     "inlet", "inlet_grate", "inlet_kerb_grate", "kerb_opening", "storm_drain", "catch_basin"
-]
+})
+
+MACH9_FEATURE_TYPES = tuple(
+    feature_type for feature_type in AVAILABLE_FEATURE_TYPES if feature_type in MACH9_FEATURE_TYPES_SET
+)
 
 
 class FeatureTypeValidator:
@@ -308,14 +340,13 @@ class FeatureTypeValidator:
     def validate_feature_types(feature_types: List[str]) -> List[str]:
         """Validate and filter feature types"""
         if not feature_types:
-            return AVAILABLE_FEATURE_TYPES
+            return list(AVAILABLE_FEATURE_TYPES)
         
-        valid_types = []
-        for feature_type in feature_types:
-            if feature_type in AVAILABLE_FEATURE_TYPES:
-                valid_types.append(feature_type)
-            else:
-                # Log warning but don't fail
-                print(f"Warning: Unknown feature type '{feature_type}' ignored")
+        valid_types = [t for t in feature_types if t in AVAILABLE_FEATURE_TYPES_SET]
+        if len(valid_types) != len(feature_types):
+            for feature_type in feature_types:
+                if feature_type not in AVAILABLE_FEATURE_TYPES_SET:
+                    # Log warning but don't fail
+                    print(f"Warning: Unknown feature type '{feature_type}' ignored")
         
-        return valid_types if valid_types else AVAILABLE_FEATURE_TYPES
\ No newline at end of file
+        return valid_types if valid_types else list(AVAILABLE_FEATURE_TYPES)
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Code Generation Helpers
+Build small specialized functions from generated source
+"""
+
+from typing import Any, Callable, Dict, List
+
+
+def compile_function(function_name: str, lines: List[str], namespace: Dict[str, Any],
+                     filename: str) -> Callable:
+    """
+    Compile generated source defining function_name and return that function.
+    
+    lines are the source lines, and namespace supplies the globals they use.
+    The source is compiled under filename (e.g. "<category matcher utility>"),
+    so tracebacks from the generated function name where it came from.
+    """
+    exec(compile("\n".join(lines), filename, "exec"), namespace)
+    return namespace[function_name]
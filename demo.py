@@ -4,115 +4,98 @@ OSM Data Query and Visualization POC - Demo Script
 Demonstrates the capabilities of the OSM query and visualization system
 """
 
+import asyncio
 import os
-import subprocess
 import sys
 from datetime import datetime
 
 
+# Independent demo runs of main.py: (title, description, arguments)
+DEMOS = [
+    (
+        "DEMO 1: Basic OSM Query (Central Park, NYC)",
+        "Querying OSM data for Central Park area...",
+        ["--bbox", "40.775,-73.975,40.785,-73.965",
+         "--outputs", "all",
+         "--output-dir", "demo_output"]
+    ),
+    (
+        "DEMO 2: Specific Feature Types (Buildings and Amenities)",
+        "Querying only buildings and amenities...",
+        ["--bbox", "40.775,-73.975,40.785,-73.965",
+         "--features", "building,amenity",
+         "--outputs", "report,map",
+         "--output-dir", "demo_buildings"]
+    ),
+    (
+        "DEMO 3: Different Location (Hyde Park, London)",
+        "Querying OSM data for Hyde Park area...",
+        ["--bbox", "51.507,-0.168,51.517,-0.158",
+         "--features", "natural,leisure,amenity",
+         "--outputs", "report,summary",
+         "--output-dir", "demo_london"]
+    ),
+]
+
+
+async def run_main_script(args, timeout: float = 60):
+    """Run main.py with the given arguments, returning (returncode, stderr)"""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "main.py", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stderr.decode(errors="replace")
+
+
 def run_demo():
     """Run a comprehensive demo of the OSM POC project"""
+    asyncio.run(_run_demo())
+
+
+async def _run_demo():
+    """Run the demos concurrently, then report each one in order"""
     
     print("=" * 80)
     print("OSM DATA QUERY AND VISUALIZATION POC - DEMO")
     print("=" * 80)
     print(f"Demo started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
-    
-    # Demo 1: Basic functionality with Central Park
-    print("DEMO 1: Basic OSM Query (Central Park, NYC)")
-    print("-" * 50)
-    print("Querying OSM data for Central Park area...")
-    
-    cmd1 = [
-        sys.executable, "main.py",
-        "--bbox", "40.775,-73.975,40.785,-73.965",
-        "--outputs", "all",
-        "--output-dir", "demo_output"
-    ]
-    
-    try:
-        result = subprocess.run(cmd1, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            print("✓ Demo 1 completed successfully!")
-            print("Generated files:")
-            if os.path.exists("demo_output"):
-                files = os.listdir("demo_output")
-                for file in files:
-                    size = os.path.getsize(f"demo_output/{file}")
-                    print(f"  - {file} ({size:,} bytes)")
-        else:
-            print(f"✗ Demo 1 failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
-        print("✗ Demo 1 timed out")
-    except Exception as e:
-        print(f"✗ Demo 1 error: {e}")
-    
+    print(f"Running {len(DEMOS)} demos concurrently...")
     print()
     
-    # Demo 2: Specific feature types
-    print("DEMO 2: Specific Feature Types (Buildings and Amenities)")
-    print("-" * 50)
-    print("Querying only buildings and amenities...")
-    
-    cmd2 = [
-        sys.executable, "main.py",
-        "--bbox", "40.775,-73.975,40.785,-73.965",
-        "--features", "building,amenity",
-        "--outputs", "report,map",
-        "--output-dir", "demo_buildings"
-    ]
-    
-    try:
-        result = subprocess.run(cmd2, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            print("✓ Demo 2 completed successfully!")
-            print("Generated files:")
-            if os.path.exists("demo_buildings"):
-                files = os.listdir("demo_buildings")
-                for file in files:
-                    size = os.path.getsize(f"demo_buildings/{file}")
-                    print(f"  - {file} ({size:,} bytes)")
-        else:
-            print(f"✗ Demo 2 failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
-        print("✗ Demo 2 timed out")
-    except Exception as e:
-        print(f"✗ Demo 2 error: {e}")
-    
-    print()
-    
-    # Demo 3: Different location (London)
-    print("DEMO 3: Different Location (Hyde Park, London)")
-    print("-" * 50)
-    print("Querying OSM data for Hyde Park area...")
-    
-    cmd3 = [
-        sys.executable, "main.py",
-        "--bbox", "51.507,-0.168,51.517,-0.158",
-        "--features", "natural,leisure,amenity",
-        "--outputs", "report,summary",
-        "--output-dir", "demo_london"
-    ]
+    results = await asyncio.gather(
+        *(run_main_script(args) for _, _, args in DEMOS),
+        return_exceptions=True
+    )
     
-    try:
-        result = subprocess.run(cmd3, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            print("✓ Demo 3 completed successfully!")
+    for number, ((title, description, args), result) in enumerate(zip(DEMOS, results), 1):
+        print(title)
+        print("-" * 50)
+        print(description)
+        
+        output_dir = args[args.index("--output-dir") + 1]
+        if isinstance(result, asyncio.TimeoutError):
+            print(f"✗ Demo {number} timed out")
+        elif isinstance(result, Exception):
+            print(f"✗ Demo {number} error: {result}")
+        elif result[0] == 0:
+            print(f"✓ Demo {number} completed successfully!")
             print("Generated files:")
-            if os.path.exists("demo_london"):
-                files = os.listdir("demo_london")
-                for file in files:
-                    size = os.path.getsize(f"demo_london/{file}")
-                    print(f"  - {file} ({size:,} bytes)")
+            if os.path.exists(output_dir):
+                with os.scandir(output_dir) as entries:
+                    for entry in entries:
+                        print(f"  - {entry.name} ({entry.stat().st_size:,} bytes)")
         else:
-            print(f"✗ Demo 3 failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
-        print("✗ Demo 3 timed out")
-    except Exception as e:
-        print(f"✗ Demo 3 error: {e}")
-    
-    print()
+            print(f"✗ Demo {number} failed: {result[1]}")
+        
+        print()
     
     # Summary
     print("DEMO SUMMARY")
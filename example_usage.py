@@ -4,15 +4,19 @@ Example Usage of OSM POC Components
 Shows how to use individual modules programmatically
 """
 
-from osm_query import OSMQuery, get_sample_bounding_box
-from report_generator import OSMReportGenerator, save_json_report
-from visualizer import OSMVisualizer, create_summary_plots
+from collections import Counter
+
+# The OSM modules are imported inside the examples that use them, so running
+# one example does not pay for the others' imports (matplotlib and folium in
+# particular).
 
 
 def example_basic_usage():
     """Basic usage example"""
     print("=== Basic Usage Example ===")
     
+    from osm_query import OSMQuery, get_sample_bounding_box
+    
     # 1. Query OSM data
     osm = OSMQuery()
     bbox = get_sample_bounding_box()  # Central Park, NYC
@@ -30,6 +34,8 @@ def example_custom_query():
     """Custom query example"""
     print("\n=== Custom Query Example ===")
     
+    from osm_query import OSMQuery
+    
     # Custom bounding box (smaller area)
     custom_bbox = (40.775, -73.975, 40.785, -73.965)
     
@@ -48,6 +54,8 @@ def example_report_generation(data, bbox):
     """Report generation example"""
     print("\n=== Report Generation Example ===")
     
+    from report_generator import OSMReportGenerator, save_json_report
+    
     # Generate text report
     generator = OSMReportGenerator()
     report = generator.generate_report(data, bbox)
@@ -69,6 +77,8 @@ def example_visualization(data, bbox):
     """Visualization example"""
     print("\n=== Visualization Example ===")
     
+    from visualizer import OSMVisualizer, create_summary_plots
+    
     visualizer = OSMVisualizer()
     
     # Create matplotlib plot
@@ -90,32 +100,27 @@ def example_data_analysis(data):
     """Data analysis example"""
     print("\n=== Data Analysis Example ===")
     
-    # Count feature types
-    feature_counts = {}
-    for element_type in ['nodes', 'ways', 'relations']:
-        elements = data.get(element_type, [])
-        for element in elements:
-            tags = element.get('tags', {})
-            for tag_key in ['amenity', 'building', 'highway', 'natural']:
+    # Count feature types in a single pass
+    wanted_keys = ('amenity', 'building', 'highway', 'natural')
+    feature_counts = Counter()
+    for element_type in ('nodes', 'ways', 'relations'):
+        for element in data.get(element_type, ()):
+            tags = element.get('tags') or {}
+            for tag_key in wanted_keys:
                 if tag_key in tags:
-                    feature_type = f"{tag_key}={tags[tag_key]}"
-                    feature_counts[feature_type] = feature_counts.get(feature_type, 0) + 1
+                    feature_counts[f"{tag_key}={tags[tag_key]}"] += 1
                     break
     
     # Show top features
     if feature_counts:
-        top_features = sorted(feature_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         print("Top 10 feature types:")
-        for feature, count in top_features:
+        for feature, count in feature_counts.most_common(10):
             print(f"  {feature}: {count}")
     
     # Geometry analysis
-    geometry_counts = {'Point': len(data.get('nodes', []))}
-    ways = data.get('ways', [])
-    for way in ways:
-        if way.get('geometry'):
-            geom_type = way['geometry'].get('type', 'Unknown')
-            geometry_counts[geom_type] = geometry_counts.get(geom_type, 0) + 1
+    geometry_counts = Counter({'Point': len(data.get('nodes', []))})
+    geometry_counts.update(way['geometry'].get('type', 'Unknown')
+                           for way in data.get('ways', ()) if way.get('geometry'))
     
     print(f"\nGeometry distribution:")
     for geom_type, count in geometry_counts.items():
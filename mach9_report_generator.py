@@ -3,11 +3,104 @@ Mach9 Engineering & Survey Report Generator
 Specialized report for civil engineering and survey work
 """
 
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple
-import json
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Any, Callable, Optional, Tuple, Iterator, Mapping
 import csv
-from io import StringIO
+import io
+
+import orjson
+
+from codegen import compile_function
+from report_generator import EMPTY_TAGS
+
+
+# Target size of each chunk yielded by iter_csv_rollup
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Features listed per bucket in the detailed breakdown sections
+DETAIL_SAMPLE_SIZE = 3
+
+# Tag keys shown under each feature in the detailed breakdown
+RELEVANT_TAG_KEYS = frozenset(['highway', 'barrier', 'man_made', 'amenity', 'power', 'waterway'])
+
+# Every tag key _analyze_all reads; elements with none of them are skipped
+ANALYZED_TAG_KEYS = frozenset([
+    'highway', 'man_made', 'barrier', 'amenity', 'waterway', 'natural',
+    'traffic_sign', 'bridge', 'tunnel', 'kerb'
+])
+
+# man_made / barrier values counted by _analyze_all, mapped to their count keys
+UTILITY_MAN_MADE_BUCKETS = {
+    'manhole': 'manholes',
+    'utility_pole': 'utility_poles',
+    'street_cabinet': 'utility_cabinets'
+}
+CIVIL_BARRIER_BUCKETS = {
+    'retaining_wall': 'retaining_walls',
+    'noise_barrier': 'noise_barriers',
+    'sound_barrier': 'noise_barriers',
+    'guard_rail': 'guard_rails',
+    'crash_barrier': 'guard_rails'
+}
+
+# Report section rules
+REPORT_SEPARATOR = "=" * 80
+SECTION_SEPARATOR = "-" * 40
+
+# Tag keys counted in the CSV rollup: the main feature keys followed by the
+# surface/access/traffic keys
+CSV_ROLLUP_KEYS = frozenset([
+    'highway', 'railway', 'aeroway', 'waterway', 'public_transport',
+    'building', 'barrier', 'man_made', 'power', 'telecom',
+    'landuse', 'natural', 'boundary', 'amenity', 'tunnel', 'bridge',
+    'kerb', 'surface', 'access', 'traffic_sign', 'traffic_calming'
+])
+
+# Precomputed "<key>_" feature prefixes; one lookup both filters a tag key
+# and yields its prefix
+CSV_ROLLUP_PREFIXES = {key: f"{key}_" for key in CSV_ROLLUP_KEYS}
+
+
+def compile_category_matcher(name: str, category_index: Dict[str, Dict[str, str]]) -> Callable:
+    """
+    Generate a feature matcher specialized to one category index.
+    
+    category_index is {tag_key: {tag_value: bucket_name}}. The returned
+    function, matcher(elements, max_per_bucket=None), tests the category's tag
+    keys inline rather than looping over category_index per element. It
+    returns the match count per bucket and the matching features, keeping at
+    most max_per_bucket features per bucket when that is set.
+    """
+    namespace = {
+        'defaultdict': defaultdict,
+        'EMPTY_TAGS': EMPTY_TAGS,
+        'CATEGORY_KEYS': frozenset(category_index)
+    }
+    lines = [
+        f"def match_{name}(elements, max_per_bucket=None):",
+        "    counts = defaultdict(int)",
+        "    features = defaultdict(list)",
+        "    for element in elements:",
+        "        tags = element.get('tags') or EMPTY_TAGS",
+        "        if tags.keys().isdisjoint(CATEGORY_KEYS):",
+        "            continue",
+    ]
+    # Keys are tested in category order, so buckets keep their first-seen order
+    for position, (main_key, buckets) in enumerate(category_index.items()):
+        namespace[f"BUCKETS_{position}"] = buckets
+        lines += [
+            f"        tag_value = tags.get({main_key!r})",
+            "        if tag_value is not None:",
+            f"            bucket = BUCKETS_{position}.get(tag_value)",
+            "            if bucket is not None:",
+            "                counts[bucket] += 1",
+            "                if max_per_bucket is None or counts[bucket] <= max_per_bucket:",
+            "                    features[bucket].append(element)",
+        ]
+    lines.append("    return counts, features")
+    
+    return compile_function(f"match_{name}", lines, namespace, f"<category matcher {name}>")
 
 
 class Mach9ReportGenerator:
@@ -57,6 +150,29 @@ class Mach9ReportGenerator:
             'barrier': ['bollard', 'fence', 'wall', 'gate'],
             'man_made': ['street_lamp', 'traffic_signals']
         }
+        
+        # Matchers for the categories used in the detailed breakdown, each
+        # specialized to its category's tag keys
+        self.transportation_matcher = compile_category_matcher(
+            'transportation', self._build_category_index(self.transportation_objects)
+        )
+        self.utility_matcher = compile_category_matcher(
+            'utility', self._build_category_index(self.utility_objects)
+        )
+        self.civil_engineering_matcher = compile_category_matcher(
+            'civil_engineering', self._build_category_index(self.civil_engineering_features)
+        )
+        self.survey_control_matcher = compile_category_matcher(
+            'survey_control', self._build_category_index(self.survey_control_points)
+        )
+    
+    @staticmethod
+    def _build_category_index(category_dict: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        """Invert a category dict into {tag_key: {tag_value: bucket_name}}"""
+        return {
+            main_key: {value: f"{main_key}_{value}" for value in sub_values}
+            for main_key, sub_values in category_dict.items()
+        }
 
     def generate_mach9_report(self, osm_data: Dict[str, Any], bbox: Tuple[float, float, float, float], output_file: str = None) -> str:
         """Generate a Mach9 engineering and survey report"""
@@ -64,117 +180,122 @@ class Mach9ReportGenerator:
         min_lat, min_lon, max_lat, max_lon = bbox
         area = (max_lat - min_lat) * (max_lon - min_lon)
         
-        report_lines = []
-        report_lines.append("=" * 80)
-        report_lines.append("MACH9 ENGINEERING & SURVEY REPORT")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-        
-        # Bounding box information
-        report_lines.append("BOUNDING BOX:")
-        report_lines.append(f"  Min Lat: {min_lat:.6f}")
-        report_lines.append(f"  Min Lon: {min_lon:.6f}")
-        report_lines.append(f"  Max Lat: {max_lat:.6f}")
-        report_lines.append(f"  Max Lon: {max_lon:.6f}")
-        report_lines.append(f"  Area: {area:.6f} square degrees")
-        report_lines.append("")
-        
         # Summary statistics
         total_elements = osm_data.get('total_elements', 0)
         nodes = osm_data.get('nodes', [])
         ways = osm_data.get('ways', [])
         relations = osm_data.get('relations', [])
         
-        report_lines.append("SUMMARY STATISTICS:")
-        report_lines.append(f"  Total Elements: {total_elements}")
-        report_lines.append(f"  Nodes: {len(nodes)}")
-        report_lines.append(f"  Ways: {len(ways)}")
-        report_lines.append(f"  Relations: {len(relations)}")
-        report_lines.append("")
-        
-        # Engineering feature analysis
-        report_lines.append("ENGINEERING FEATURE ANALYSIS:")
-        report_lines.append("-" * 40)
-        report_lines.append("")
-        
         # Analyze features by category
-        transportation_count = self._analyze_transportation_objects(nodes, ways, relations)
-        utility_count = self._analyze_utility_objects(nodes, ways, relations)
-        civil_count = self._analyze_civil_engineering_features(nodes, ways, relations)
-        survey_count = self._analyze_survey_control_points(nodes, ways, relations)
-        drainage_count = self._analyze_drainage_structures(nodes, ways, relations)
-        
-        # Summary counts
-        report_lines.append("TRANSPORTATION OBJECTS:")
-        report_lines.append(f"  Traffic Signs: {transportation_count.get('traffic_signs', 0)}")
-        report_lines.append(f"  Traffic Lights: {transportation_count.get('traffic_lights', 0)}")
-        report_lines.append(f"  Bollards: {transportation_count.get('bollards', 0)}")
-        report_lines.append(f"  Street Lights: {transportation_count.get('street_lights', 0)}")
-        report_lines.append("")
-        
-        report_lines.append("UTILITY OBJECTS:")
-        report_lines.append(f"  Manholes: {utility_count.get('manholes', 0)}")
-        report_lines.append(f"  Utility Infrastructure: {utility_count.get('utility_poles', 0) + utility_count.get('utility_cabinets', 0)}")
-        report_lines.append(f"  Fire Hydrants: {utility_count.get('fire_hydrants', 0)}")
-        report_lines.append("")
-        
-        report_lines.append("CIVIL ENGINEERING FEATURES:")
-        report_lines.append(f"  Bridges: {civil_count.get('bridges', 0)}")
-        report_lines.append(f"  Tunnels: {civil_count.get('tunnels', 0)}")
-        report_lines.append(f"  Water Structures: {civil_count.get('water_structures', 0)}")
-        report_lines.append(f"  Kerbs/Curbs: {civil_count.get('kerbs', 0)}")
-        report_lines.append(f"  Retaining Walls: {civil_count.get('retaining_walls', 0)}")
-        report_lines.append(f"  Noise Barriers: {civil_count.get('noise_barriers', 0)}")
-        report_lines.append(f"  Guard Rails: {civil_count.get('guard_rails', 0)}")
-        report_lines.append(f"  Steps/Ramps: {civil_count.get('steps_ramps', 0)}")
-        report_lines.append("")
+        # Materialized once; the analyzer and four breakdown lookups each walk it
+        all_elements = nodes + ways + relations
+        analysis = self._analyze_all(all_elements)
+        transportation_count = analysis['transportation']
+        utility_count = analysis['utility']
+        civil_count = analysis['civil']
+        survey_count = analysis['survey']
+        drainage_count = analysis['drainage']
+        
+        report_lines = [
+            REPORT_SEPARATOR,
+            "MACH9 ENGINEERING & SURVEY REPORT",
+            REPORT_SEPARATOR,
+            "",
+            
+            # Bounding box information
+            "BOUNDING BOX:",
+            f"  Min Lat: {min_lat:.6f}",
+            f"  Min Lon: {min_lon:.6f}",
+            f"  Max Lat: {max_lat:.6f}",
+            f"  Max Lon: {max_lon:.6f}",
+            f"  Area: {area:.6f} square degrees",
+            "",
+            
+            "SUMMARY STATISTICS:",
+            f"  Total Elements: {total_elements}",
+            f"  Nodes: {len(nodes)}",
+            f"  Ways: {len(ways)}",
+            f"  Relations: {len(relations)}",
+            "",
+            
+            # Engineering feature analysis
+            "ENGINEERING FEATURE ANALYSIS:",
+            SECTION_SEPARATOR,
+            "",
+            
+            # Summary counts
+            "TRANSPORTATION OBJECTS:",
+            f"  Traffic Signs: {transportation_count.get('traffic_signs', 0)}",
+            f"  Traffic Lights: {transportation_count.get('traffic_lights', 0)}",
+            f"  Bollards: {transportation_count.get('bollards', 0)}",
+            f"  Street Lights: {transportation_count.get('street_lights', 0)}",
+            "",
+            
+            "UTILITY OBJECTS:",
+            f"  Manholes: {utility_count.get('manholes', 0)}",
+            f"  Utility Infrastructure: {utility_count.get('utility_poles', 0) + utility_count.get('utility_cabinets', 0)}",
+            f"  Fire Hydrants: {utility_count.get('fire_hydrants', 0)}",
+            "",
+            
+            "CIVIL ENGINEERING FEATURES:",
+            f"  Bridges: {civil_count.get('bridges', 0)}",
+            f"  Tunnels: {civil_count.get('tunnels', 0)}",
+            f"  Water Structures: {civil_count.get('water_structures', 0)}",
+            f"  Kerbs/Curbs: {civil_count.get('kerbs', 0)}",
+            f"  Retaining Walls: {civil_count.get('retaining_walls', 0)}",
+            f"  Noise Barriers: {civil_count.get('noise_barriers', 0)}",
+            f"  Guard Rails: {civil_count.get('guard_rails', 0)}",
+            f"  Steps/Ramps: {civil_count.get('steps_ramps', 0)}",
+            "",
+        ]
         
         # Detailed feature breakdown
-        report_lines.append("=" * 80)
-        report_lines.append("DETAILED FEATURE BREAKDOWN")
-        report_lines.append("=" * 80)
+        report_lines.extend([REPORT_SEPARATOR, "DETAILED FEATURE BREAKDOWN", REPORT_SEPARATOR])
         
         # Transportation objects detail
         report_lines.append("TRANSPORTATION OBJECTS:")
-        self._add_detailed_breakdown(report_lines, nodes, ways, relations, self.transportation_objects)
+        self._add_detailed_breakdown(report_lines, all_elements, self.transportation_matcher)
         report_lines.append("")
         
         # Utility objects detail
         report_lines.append("UTILITY OBJECTS:")
-        self._add_detailed_breakdown(report_lines, nodes, ways, relations, self.utility_objects)
+        self._add_detailed_breakdown(report_lines, all_elements, self.utility_matcher)
         report_lines.append("")
         
         # Civil engineering features detail
         report_lines.append("CIVIL ENGINEERING FEATURES:")
-        self._add_detailed_breakdown(report_lines, nodes, ways, relations, self.civil_engineering_features)
+        self._add_detailed_breakdown(report_lines, all_elements, self.civil_engineering_matcher)
         report_lines.append("")
         
         # Survey control points
         report_lines.append("SURVEY CONTROL POINTS:")
-        survey_features = self._find_features_by_category(nodes, ways, relations, self.survey_control_points)
-        if survey_features:
-            for feature_type, features in survey_features.items():
-                if features:
-                    report_lines.append(f"  {feature_type.title()}: {len(features)} found")
-                    for feature in features[:3]:  # Show first 3
-                        name = feature.get('tags', {}).get('name', 'Unnamed')
-                        element_type = feature.get('type', 'unknown')
-                        report_lines.append(f"    - {name} ({element_type})")
+        survey_counts, survey_features = self.survey_control_matcher(all_elements, DETAIL_SAMPLE_SIZE)
+        if survey_counts:
+            for feature_type, count in survey_counts.items():
+                report_lines.append(f"  {feature_type.title()}: {count} found")
+                for feature in survey_features[feature_type]:
+                    name = (feature.get('tags') or EMPTY_TAGS).get('name', 'Unnamed')
+                    element_type = feature.get('type', 'unknown')
+                    report_lines.append(f"    - {name} ({element_type})")
         else:
             report_lines.append("  No features found in this category.")
         report_lines.append("")
         
         # Infrastructure analysis
-        report_lines.append("=" * 80)
-        report_lines.append("INFRASTRUCTURE ANALYSIS")
-        report_lines.append("=" * 80)
-        
-        # Highway infrastructure
-        highway_types = defaultdict(int)
-        for way in ways:
-            tags = way.get('tags', {})
-            if 'highway' in tags:
-                highway_types[tags['highway']] += 1
+        report_lines.extend([REPORT_SEPARATOR, "INFRASTRUCTURE ANALYSIS", REPORT_SEPARATOR])
+        
+        # Highway (ways only), barrier and man-made infrastructure. Counter
+        # construction runs its counting loop in C, which beats one fused
+        # Python loop doing the three += increments
+        highway_types = Counter(
+            tags['highway'] for way in ways if (tags := way.get('tags')) and 'highway' in tags
+        )
+        barrier_types = Counter(
+            tags['barrier'] for element in chain(nodes, ways) if (tags := element.get('tags')) and 'barrier' in tags
+        )
+        man_made_types = Counter(
+            tags['man_made'] for element in chain(nodes, ways) if (tags := element.get('tags')) and 'man_made' in tags
+        )
         
         if highway_types:
             report_lines.append("HIGHWAY INFRASTRUCTURE:")
@@ -182,26 +303,12 @@ class Mach9ReportGenerator:
                 report_lines.append(f"  {hw_type}: {count} segments")
             report_lines.append("")
         
-        # Barrier infrastructure
-        barrier_types = defaultdict(int)
-        for element in nodes + ways:
-            tags = element.get('tags', {})
-            if 'barrier' in tags:
-                barrier_types[tags['barrier']] += 1
-        
         if barrier_types:
             report_lines.append("BARRIER INFRASTRUCTURE:")
             for barrier_type, count in sorted(barrier_types.items()):
                 report_lines.append(f"  {barrier_type}: {count} features")
             report_lines.append("")
         
-        # Man-made infrastructure
-        man_made_types = defaultdict(int)
-        for element in nodes + ways:
-            tags = element.get('tags', {})
-            if 'man_made' in tags:
-                man_made_types[tags['man_made']] += 1
-        
         if man_made_types:
             report_lines.append("MAN-MADE INFRASTRUCTURE:")
             for mm_type, count in sorted(man_made_types.items()):
@@ -209,9 +316,7 @@ class Mach9ReportGenerator:
             report_lines.append("")
         
         # Survey and engineering recommendations
-        report_lines.append("=" * 80)
-        report_lines.append("SURVEY & ENGINEERING RECOMMENDATIONS")
-        report_lines.append("=" * 80)
+        report_lines.extend([REPORT_SEPARATOR, "SURVEY & ENGINEERING RECOMMENDATIONS", REPORT_SEPARATOR])
         
         recommendations = []
         
@@ -235,7 +340,7 @@ class Mach9ReportGenerator:
             report_lines.append(rec)
         
         report_lines.append("")
-        report_lines.append("=" * 80)
+        report_lines.append(REPORT_SEPARATOR)
         
         report_content = "\n".join(report_lines)
         
@@ -245,225 +350,198 @@ class Mach9ReportGenerator:
         
         return report_content
 
-    def _analyze_transportation_objects(self, nodes: List, ways: List, relations: List) -> Dict[str, int]:
-        """Analyze transportation-related objects"""
-        counts = defaultdict(int)
-        
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
-            
-            # Traffic signals and signs
-            if tags.get('highway') == 'traffic_signals':
-                counts['traffic_lights'] += 1
-            elif tags.get('highway') in ['stop', 'give_way'] or tags.get('traffic_sign'):
-                counts['traffic_signs'] += 1
-            
-            # Bollards and barriers
-            if tags.get('barrier') == 'bollard':
-                counts['bollards'] += 1
-            
-            # Street lights
-            if tags.get('man_made') == 'street_lamp' or tags.get('highway') == 'street_lamp':
-                counts['street_lights'] += 1
-        
-        return dict(counts)
-
-    def _analyze_utility_objects(self, nodes: List, ways: List, relations: List) -> Dict[str, int]:
-        """Analyze utility-related objects"""
-        counts = defaultdict(int)
-        
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
-            
-            # Manholes
-            if tags.get('man_made') == 'manhole':
-                counts['manholes'] += 1
+    def _analyze_all(self, elements: List) -> Dict[str, Mapping[str, int]]:
+        """
+        Count transportation, utility, civil engineering, survey and drainage
+        features in a single pass over elements.
+        
+        Returns one count dict per category, keyed 'transportation', 'utility',
+        'civil', 'survey' and 'drainage'.
+        """
+        transportation = defaultdict(int)
+        utility = defaultdict(int)
+        civil = defaultdict(int)
+        survey = defaultdict(int)
+        drainage = defaultdict(int)
+        
+        for element in elements:
+            tags = element.get('tags') or EMPTY_TAGS
+            # Most elements carry none of the keys below (shops, addresses, ...)
+            if tags.keys().isdisjoint(ANALYZED_TAG_KEYS):
+                continue
+            highway = tags.get('highway')
+            man_made = tags.get('man_made')
+            barrier = tags.get('barrier')
+            amenity = tags.get('amenity')
+            waterway = tags.get('waterway')
             
-            # Utility poles and cabinets
-            if tags.get('man_made') in ['utility_pole', 'street_cabinet']:
-                if tags.get('man_made') == 'utility_pole':
-                    counts['utility_poles'] += 1
-                else:
-                    counts['utility_cabinets'] += 1
+            # Transportation: traffic signals and signs
+            if highway == 'traffic_signals':
+                transportation['traffic_lights'] += 1
+            elif highway in ('stop', 'give_way') or tags.get('traffic_sign'):
+                transportation['traffic_signs'] += 1
             
-            # Fire hydrants
-            if tags.get('amenity') == 'fire_hydrant':
-                counts['fire_hydrants'] += 1
-        
-        return dict(counts)
-
-    def _analyze_civil_engineering_features(self, nodes: List, ways: List, relations: List) -> Dict[str, int]:
-        """Analyze civil engineering features"""
-        counts = defaultdict(int)
-        
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
+            # Transportation: bollards and street lights
+            if barrier == 'bollard':
+                transportation['bollards'] += 1
+            if man_made == 'street_lamp' or highway == 'street_lamp':
+                transportation['street_lights'] += 1
             
-            # Bridges
-            if tags.get('man_made') == 'bridge' or tags.get('bridge'):
-                counts['bridges'] += 1
+            # Utility: manholes, poles and cabinets
+            bucket = UTILITY_MAN_MADE_BUCKETS.get(man_made)
+            if bucket is not None:
+                utility[bucket] += 1
             
-            # Tunnels
-            if tags.get('tunnel') or tags.get('man_made') == 'tunnel':
-                counts['tunnels'] += 1
+            # Utility: fire hydrants
+            if amenity == 'fire_hydrant':
+                utility['fire_hydrants'] += 1
             
-            # Water structures
-            if tags.get('waterway') or tags.get('natural') == 'water':
-                counts['water_structures'] += 1
+            # Civil engineering: bridges, tunnels and water structures
+            if man_made == 'bridge' or tags.get('bridge'):
+                civil['bridges'] += 1
+            if tags.get('tunnel') or man_made == 'tunnel':
+                civil['tunnels'] += 1
+            if waterway or tags.get('natural') == 'water':
+                civil['water_structures'] += 1
             
-            # Kerbs/Curbs
+            # Civil engineering: kerbs/curbs
             if tags.get('kerb'):
-                counts['kerbs'] += 1
+                civil['kerbs'] += 1
             
-            # Retaining walls
-            if tags.get('barrier') == 'retaining_wall':
-                counts['retaining_walls'] += 1
+            # Civil engineering: retaining walls, noise barriers and guard rails
+            bucket = CIVIL_BARRIER_BUCKETS.get(barrier)
+            if bucket is not None:
+                civil[bucket] += 1
             
-            # Noise barriers
-            if tags.get('barrier') in ['noise_barrier', 'sound_barrier']:
-                counts['noise_barriers'] += 1
+            # Civil engineering: steps and ramps
+            if highway in ('steps', 'ramp'):
+                civil['steps_ramps'] += 1
             
-            # Guard rails
-            if tags.get('barrier') in ['guard_rail', 'crash_barrier']:
-                counts['guard_rails'] += 1
+            # Survey control points
+            if man_made in ('survey_point', 'benchmark', 'marker'):
+                survey['survey_points'] += 1
+            elif amenity == 'benchmark':
+                survey['benchmarks'] += 1
             
-            # Steps and ramps
-            if tags.get('highway') in ['steps', 'ramp']:
-                counts['steps_ramps'] += 1
-        
-        return dict(counts)
+            # Drainage structures
+            if man_made == 'manhole':
+                drainage['manholes'] += 1
+            elif waterway in ('drain', 'ditch'):
+                drainage['drains'] += 1
+        
+        survey['total'] = survey['survey_points'] + survey['benchmarks']
+        
+        return {
+            'transportation': transportation,
+            'utility': utility,
+            'civil': civil,
+            'survey': survey,
+            'drainage': drainage
+        }
 
-    def _analyze_survey_control_points(self, nodes: List, ways: List, relations: List) -> Dict[str, int]:
-        """Analyze survey control points"""
-        counts = defaultdict(int)
-        
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
-            
-            if tags.get('man_made') in ['survey_point', 'benchmark', 'marker']:
-                counts['survey_points'] += 1
-            elif tags.get('amenity') == 'benchmark':
-                counts['benchmarks'] += 1
-        
-        counts['total'] = counts['survey_points'] + counts['benchmarks']
-        return dict(counts)
+    def _add_detailed_breakdown(self, report_lines: List[str], elements: List, matcher: Callable):
+        """Add detailed breakdown for a category, given its compile_category_matcher matcher"""
+        counts, features = matcher(elements, DETAIL_SAMPLE_SIZE)
+        if not counts:
+            return
+        
+        for feature_type, count in counts.items():
+            report_lines.append(f"  {feature_type.title()} ({count} found):")
+            for feature in features[feature_type]:
+                tags = feature.get('tags') or EMPTY_TAGS
+                report_lines.append(f"    - {tags.get('name', 'Unnamed')} ({feature.get('type', 'unknown')})")
+                # Show relevant tags, in the feature's own tag order
+                tag_str = ", ".join(f"{k}={v}" for k, v in tags.items() if k in RELEVANT_TAG_KEYS)
+                if tag_str:
+                    report_lines.append(f"      Tags: {tag_str}")
 
-    def _analyze_drainage_structures(self, nodes: List, ways: List, relations: List) -> Dict[str, int]:
-        """Analyze drainage structures"""
-        counts = defaultdict(int)
+    def generate_csv_rollup(self, osm_data: Dict[str, Any], output_file: str = None) -> Optional[str]:
+        """
+        Generate CSV rollup with feature counts.
         
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
-            
-            if tags.get('man_made') == 'manhole':
-                counts['manholes'] += 1
-            elif tags.get('waterway') in ['drain', 'ditch']:
-                counts['drains'] += 1
+        With output_file, rows are written straight to the file and None is
+        returned; otherwise the CSV is returned as a string.
+        """
+        if output_file:
+            # csv.writer emits one small write per row; a 1 MiB buffer
+            # turns those into a handful of syscalls
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                csv.writer(f).writerows(self._csv_rollup_rows(osm_data))
+            return None
         
-        return dict(counts)
-
-    def _add_detailed_breakdown(self, report_lines: List[str], nodes: List, ways: List, relations: List, category_dict: Dict):
-        """Add detailed breakdown for a category"""
-        features = self._find_features_by_category(nodes, ways, relations, category_dict)
-        
-        for feature_type, feature_list in features.items():
-            if feature_list:
-                report_lines.append(f"  {feature_type.title()} ({len(feature_list)} found):")
-                for feature in feature_list[:3]:  # Show first 3
-                    name = feature.get('tags', {}).get('name', 'Unnamed')
-                    element_type = feature.get('type', 'unknown')
-                    report_lines.append(f"    - {name} ({element_type})")
-                    # Show relevant tags
-                    tags = feature.get('tags', {})
-                    relevant_tags = {k: v for k, v in tags.items() if k in ['highway', 'barrier', 'man_made', 'amenity', 'power', 'waterway']}
-                    if relevant_tags:
-                        tag_str = ", ".join([f"{k}={v}" for k, v in relevant_tags.items()])
-                        report_lines.append(f"      Tags: {tag_str}")
+        return "".join(self.iter_csv_rollup(osm_data))
 
-    def _find_features_by_category(self, nodes: List, ways: List, relations: List, category_dict: Dict) -> Dict[str, List]:
-        """Find features that match a category dictionary"""
-        features = defaultdict(list)
-        
-        for element in nodes + ways + relations:
-            tags = element.get('tags', {})
-            
-            for main_key, sub_values in category_dict.items():
-                if main_key in tags:
-                    tag_value = tags[main_key]
-                    if tag_value in sub_values:
-                        features[f"{main_key}_{tag_value}"].append(element)
-        
-        return dict(features)
+    def iter_csv_rollup(self, osm_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the CSV rollup in chunks of about CSV_CHUNK_SIZE characters, for streaming responses"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in self._csv_rollup_rows(osm_data):
+            writer.writerow(row)
+            if buffer.tell() >= CSV_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
 
-    def generate_csv_rollup(self, osm_data: Dict[str, Any], output_file: str = None) -> str:
-        """Generate CSV rollup with feature counts"""
-        
-        # Initialize counters
-        feature_counts = defaultdict(int)
-        tag_counts = defaultdict(int)
-        element_type_counts = defaultdict(int)
+    def _csv_rollup_rows(self, osm_data: Dict[str, Any]) -> Iterator[List]:
+        """Count features and yield the rollup rows"""
         
-        # Process all elements
+        # Flatten the rollup-relevant tags of every element into one list, then
+        # count it with Counter, whose counting loop runs in C
+        element_type_counts = {}
+        rollup_tags = []
         for element_type in ['nodes', 'ways', 'relations']:
             elements = osm_data.get(element_type, [])
             element_type_counts[element_type] = len(elements)
-            
-            for element in elements:
-                tags = element.get('tags', {})
-                
-                # Count main feature types
-                for key, value in tags.items():
-                    if key in ['highway', 'railway', 'aeroway', 'waterway', 'public_transport',
-                              'building', 'barrier', 'man_made', 'power', 'telecom',
-                              'landuse', 'natural', 'boundary', 'amenity', 'tunnel', 'bridge']:
-                        feature_counts[f"{key}_{value}"] += 1
-                        tag_counts[key] += 1
-                    elif key in ['kerb', 'surface', 'access', 'traffic_sign', 'traffic_calming']:
-                        feature_counts[f"{key}_{value}"] += 1
-                        tag_counts[key] += 1
-        
-        # Create CSV content
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Feature_Type', 'Feature_Value', 'Count', 'Category'])
-        
-        # Write element type summary
-        writer.writerow(['ELEMENT_TYPES', '', '', 'SUMMARY'])
-        for element_type, count in element_type_counts.items():
-            writer.writerow([element_type.upper(), '', count, 'ELEMENT_COUNT'])
-        
-        writer.writerow(['', '', '', ''])  # Empty row
+            rollup_tags.extend(
+                (key, prefix + value)
+                for element in elements
+                for key, value in (element.get('tags') or EMPTY_TAGS).items()
+                if (prefix := CSV_ROLLUP_PREFIXES.get(key)) is not None
+            )
         
-        # Write main feature counts
-        writer.writerow(['MAIN_FEATURES', '', '', 'FEATURE_BREAKDOWN'])
-        for feature, count in sorted(feature_counts.items()):
-            if '_' in feature:
-                main_type, sub_type = feature.split('_', 1)
-                writer.writerow([main_type, sub_type, count, 'FEATURE_COUNT'])
-            else:
-                writer.writerow([feature, '', count, 'FEATURE_COUNT'])
+        feature_counts = Counter(feature for _, feature in rollup_tags)
+        tag_counts = Counter(key for key, _ in rollup_tags)
         
-        writer.writerow(['', '', '', ''])  # Empty row
+        # Header
+        yield ['Feature_Type', 'Feature_Value', 'Count', 'Category']
         
-        # Write tag summary
-        writer.writerow(['TAG_SUMMARY', '', '', 'TAG_COUNTS'])
+        # Element type summary
+        yield ['ELEMENT_TYPES', '', '', 'SUMMARY']
+        for element_type, count in element_type_counts.items():
+            yield [element_type.upper(), '', count, 'ELEMENT_COUNT']
+        
+        yield ['', '', '', '']  # Empty row
+        
+        # Main feature counts
+        yield ['MAIN_FEATURES', '', '', 'FEATURE_BREAKDOWN']
+        # Every feature is "<key>_<value>". Split each once and sort within its
+        # main type; no rollup main type is a prefix of another, so this is the
+        # same order as sorting the full feature strings.
+        feature_groups = defaultdict(list)
+        for feature, count in feature_counts.items():
+            main_type, sub_type = feature.split('_', 1)
+            feature_groups[main_type].append((sub_type, count))
+        for main_type in sorted(feature_groups):
+            for sub_type, count in sorted(feature_groups[main_type]):
+                yield [main_type, sub_type, count, 'FEATURE_COUNT']
+        
+        yield ['', '', '', '']  # Empty row
+        
+        # Tag summary
+        yield ['TAG_SUMMARY', '', '', 'TAG_COUNTS']
         for tag, count in sorted(tag_counts.items()):
-            writer.writerow([tag, '', count, 'TAG_COUNT'])
-        
-        csv_content = output.getvalue()
-        output.close()
-        
-        if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(csv_content)
-        
-        return csv_content
+            yield [tag, '', count, 'TAG_COUNT']
 
 
 def save_mach9_json_report(osm_data: Dict[str, Any], output_file: str):
-    """Save Mach9-specific data as JSON"""
+    """
+    Save Mach9-specific data as JSON.
+    
+    Element bodies appear once, under raw_data. The engineering_features lists
+    hold {"type", "id"} references into it (OSM ids are unique per type).
+    """
     mach9_data = {
         "report_type": "mach9_engineering_survey",
         "summary": {
@@ -481,38 +559,44 @@ def save_mach9_json_report(osm_data: Dict[str, Any], output_file: str):
         "raw_data": osm_data
     }
     
-    # Filter and categorize features for Mach9
-    generator = Mach9ReportGenerator()
+    # Filter and categorize features for Mach9 in one pass. The categories
+    # overlap (a manhole is both a utility and a drainage structure), so each
+    # check is independent.
+    engineering_features = mach9_data["engineering_features"]
+    transportation_objects = engineering_features["transportation_objects"]
+    utility_objects = engineering_features["utility_objects"]
+    civil_engineering_features = engineering_features["civil_engineering_features"]
+    drainage_structures = engineering_features["drainage_structures"]
     
-    # Transportation objects
-    for element in osm_data.get('nodes', []) + osm_data.get('ways', []) + osm_data.get('relations', []):
-        tags = element.get('tags', {})
-        if (tags.get('highway') in ['traffic_signals', 'stop', 'give_way'] or 
+    for element in chain(osm_data.get('nodes', []), osm_data.get('ways', []), osm_data.get('relations', [])):
+        tags = element.get('tags') or EMPTY_TAGS
+        element_ref = {"type": element.get('type'), "id": element.get('id')}
+        highway = tags.get('highway')
+        man_made = tags.get('man_made')
+        waterway = tags.get('waterway')
+        
+        # Transportation objects
+        if (highway in ('traffic_signals', 'stop', 'give_way') or 
             tags.get('barrier') == 'bollard' or 
-            tags.get('man_made') == 'street_lamp'):
-            mach9_data["engineering_features"]["transportation_objects"].append(element)
-    
-    # Utility objects
-    for element in osm_data.get('nodes', []) + osm_data.get('ways', []) + osm_data.get('relations', []):
-        tags = element.get('tags', {})
-        if (tags.get('man_made') in ['manhole', 'utility_pole', 'street_cabinet'] or 
+            man_made == 'street_lamp'):
+            transportation_objects.append(element_ref)
+        
+        # Utility objects
+        if (man_made in ('manhole', 'utility_pole', 'street_cabinet') or 
             tags.get('amenity') == 'fire_hydrant'):
-            mach9_data["engineering_features"]["utility_objects"].append(element)
-    
-    # Civil engineering features
-    for element in osm_data.get('nodes', []) + osm_data.get('ways', []) + osm_data.get('relations', []):
-        tags = element.get('tags', {})
-        if (tags.get('man_made') == 'bridge' or 
-            tags.get('waterway') or 
+            utility_objects.append(element_ref)
+        
+        # Civil engineering features
+        if (man_made == 'bridge' or 
+            waterway or 
             tags.get('natural') == 'water'):
-            mach9_data["engineering_features"]["civil_engineering_features"].append(element)
-    
-    # Drainage structures
-    for element in osm_data.get('nodes', []) + osm_data.get('ways', []) + osm_data.get('relations', []):
-        tags = element.get('tags', {})
-        if (tags.get('man_made') == 'manhole' or 
-            tags.get('waterway') in ['drain', 'ditch']):
-            mach9_data["engineering_features"]["drainage_structures"].append(element)
+            civil_engineering_features.append(element_ref)
+        
+        # Drainage structures
+        if man_made == 'manhole' or waterway in ('drain', 'ditch'):
+            drainage_structures.append(element_ref)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(mach9_data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    # orjson encodes straight to UTF-8 bytes in one call; OPT_INDENT_2 keeps
+    # the same layout as json.dump(indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(mach9_data, option=orjson.OPT_INDENT_2))
\ No newline at end of file
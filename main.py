@@ -5,16 +5,33 @@ Main script that orchestrates the entire workflow
 """
 
 import argparse
+import hashlib
+import inspect
 import sys
 import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, List
 import json
 
-from osm_query import OSMQuery, get_sample_bounding_box
+import orjson
+
+from osm_query import OSMQuery, DEFAULT_CACHE_DIR, get_sample_bounding_box
 from report_generator import OSMReportGenerator, save_json_report
 from visualizer import OSMVisualizer, create_summary_plots
 
 
+# Quick-stats feature keys, in priority order: an element counts under the first one it has
+QUICK_STATS_KEYS = ('amenity', 'building', 'highway', 'landuse', 'leisure',
+                    'natural', 'shop', 'tourism', 'waterway')
+QUICK_STATS_KEY_SET = frozenset(QUICK_STATS_KEYS)
+
+# Rendered maps kept in <output_dir>/.cache; older ones are deleted, and the
+# directory can be removed at any time to clear the cache
+MAP_CACHE_MAX_ENTRIES = 8
+
+
 def parse_bbox(bbox_str: str) -> Tuple[float, float, float, float]:
     """
     Parse bounding box string in format: min_lat,min_lon,max_lat,max_lon
@@ -50,6 +67,86 @@ def parse_bbox(bbox_str: str) -> Tuple[float, float, float, float]:
         sys.exit(1)
 
 
+def _run_report(osm_data, bbox, output_dir):
+    """Write the text report and raw JSON data"""
+    generator = OSMReportGenerator()
+    report_file = os.path.join(output_dir, "osm_report.txt")
+    generator.generate_report(osm_data, bbox, report_file)
+    print(f"✓ Text report generated: {report_file}")
+    
+    # Also save raw JSON data
+    json_file = os.path.join(output_dir, "osm_data.json")
+    save_json_report(osm_data, json_file)
+    print(f"✓ Raw data saved: {json_file}")
+
+
+def _run_plot(osm_data, bbox, output_dir, show_plot=False):
+    """Render the matplotlib visualization"""
+    visualizer = OSMVisualizer()
+    plot_file = os.path.join(output_dir, "osm_plot.png")
+    if visualizer.create_matplotlib_plot(osm_data, bbox, plot_file, show_plot=show_plot):
+        print(f"✓ Matplotlib plot generated: {plot_file}")
+
+
+def _map_renderer_digest() -> str:
+    """Hash of the visualizer source, so cached maps are dropped when rendering changes"""
+    with open(inspect.getsourcefile(OSMVisualizer), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def _prune_map_cache(cache_dir: str) -> None:
+    """Delete all but the MAP_CACHE_MAX_ENTRIES most recently used cached maps"""
+    cached_maps = sorted(
+        (entry for entry in os.scandir(cache_dir) if entry.name.startswith('map_')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True
+    )
+    for entry in cached_maps[MAP_CACHE_MAX_ENTRIES:]:
+        os.remove(entry.path)
+
+
+def _run_map(osm_data, bbox, output_dir):
+    """Render the interactive folium map, reusing a cached render of identical input"""
+    map_file = os.path.join(output_dir, "osm_map.html")
+    
+    # Folium rendering is slow on large datasets, so key a copy of the HTML
+    # by a hash of everything that goes into the map, renderer included
+    signature = hashlib.blake2b(
+        orjson.dumps({"bbox": list(bbox), "osm_data": osm_data, "renderer": _map_renderer_digest()},
+                     option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    cache_dir = os.path.join(output_dir, ".cache")
+    cached_map = os.path.join(cache_dir, f"map_{signature}.html")
+    
+    if os.path.exists(cached_map):
+        shutil.copyfile(cached_map, map_file)
+        # Touch the entry so pruning keeps recently used maps
+        os.utime(cached_map)
+        print(f"✓ Interactive map reused from cache: {map_file}")
+        return
+    
+    visualizer = OSMVisualizer()
+    if not visualizer.create_folium_map(osm_data, bbox, map_file):
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    shutil.copyfile(map_file, cached_map)
+    _prune_map_cache(cache_dir)
+    print(f"✓ Interactive map generated: {map_file}")
+
+
+def _run_summary(osm_data, bbox, output_dir):
+    """Render the summary plots"""
+    if create_summary_plots(osm_data, output_dir):
+        print(f"✓ Summary plots generated in: {output_dir}")
+
+
+OUTPUT_RUNNERS = {
+    'report': _run_report,
+    'plot': _run_plot,
+    'map': _run_map,
+    'summary': _run_summary,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="OSM Data Query and Visualization POC",
@@ -106,6 +203,12 @@ Examples:
         help='Display matplotlib plot (default: False)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Always query Overpass instead of reusing cached responses in {DEFAULT_CACHE_DIR}'
+    )
+    
     args = parser.parse_args()
     
     # Set up output directory
@@ -133,7 +236,7 @@ Examples:
     
     # Step 1: Query OSM data
     print("\n1. Querying OSM data...")
-    osm = OSMQuery()
+    osm = OSMQuery(cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
     osm_data = osm.query_bounding_box(*bbox, feature_types=feature_types)
     
     if 'error' in osm_data:
@@ -150,38 +253,19 @@ Examples:
     # Step 2: Generate outputs based on user selection
     outputs = [args.outputs] if args.outputs != 'all' else ['report', 'plot', 'map', 'summary']
     
-    if 'report' in outputs:
-        print("\n2. Generating text report...")
-        generator = OSMReportGenerator()
-        report_file = os.path.join(args.output_dir, "osm_report.txt")
-        report = generator.generate_report(osm_data, bbox, report_file)
-        print(f"✓ Text report generated: {report_file}")
-        
-        # Also save raw JSON data
-        json_file = os.path.join(args.output_dir, "osm_data.json")
-        save_json_report(osm_data, json_file)
-        print(f"✓ Raw data saved: {json_file}")
-    
-    if 'plot' in outputs:
-        print("\n3. Creating matplotlib visualization...")
-        visualizer = OSMVisualizer()
-        plot_file = os.path.join(args.output_dir, "osm_plot.png")
-        visualizer.create_matplotlib_plot(
-            osm_data, bbox, plot_file, show_plot=args.show_plot
-        )
-        print(f"✓ Matplotlib plot generated: {plot_file}")
-    
-    if 'map' in outputs:
-        print("\n4. Creating interactive map...")
-        visualizer = OSMVisualizer()
-        map_file = os.path.join(args.output_dir, "osm_map.html")
-        visualizer.create_folium_map(osm_data, bbox, map_file)
-        print(f"✓ Interactive map generated: {map_file}")
-    
-    if 'summary' in outputs:
-        print("\n5. Creating summary plots...")
-        create_summary_plots(osm_data, args.output_dir)
-        print(f"✓ Summary plots generated in: {args.output_dir}")
+    # Outputs are independent, so render them in parallel processes.
+    # An interactive plot window has to stay in this process.
+    print("\n2. Generating outputs: " + ", ".join(outputs))
+    parallel = [o for o in outputs if not (o == 'plot' and args.show_plot)]
+    with ProcessPoolExecutor(max_workers=min(4, len(parallel)) or 1) as executor:
+        futures = [
+            executor.submit(OUTPUT_RUNNERS[output], osm_data, bbox, args.output_dir)
+            for output in parallel
+        ]
+        if len(parallel) < len(outputs):
+            _run_plot(osm_data, bbox, args.output_dir, show_plot=True)
+        for future in futures:
+            future.result()
     
     # Final summary
     print("\n" + "="*60)
@@ -211,20 +295,20 @@ Examples:
     # Show quick stats from the report
     if 'report' in outputs:
         print("\nQuick Stats:")
-        feature_counts = {}
+        feature_counts = Counter()
         for element_type in ['nodes', 'ways', 'relations']:
             elements = osm_data.get(element_type, [])
             for element in elements:
-                tags = element.get('tags', {})
-                for tag_key in ['amenity', 'building', 'highway', 'landuse', 'leisure', 
-                               'natural', 'shop', 'tourism', 'waterway']:
+                tags = element.get('tags') or {}
+                if tags.keys().isdisjoint(QUICK_STATS_KEY_SET):
+                    continue
+                for tag_key in QUICK_STATS_KEYS:
                     if tag_key in tags:
-                        feature_type = f"{tag_key}={tags[tag_key]}"
-                        feature_counts[feature_type] = feature_counts.get(feature_type, 0) + 1
+                        feature_counts[f"{tag_key}={tags[tag_key]}"] += 1
                         break
         
         if feature_counts:
-            top_features = sorted(feature_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+            top_features = feature_counts.most_common(5)
             print("Top 5 feature types:")
             for feature, count in top_features:
                 print(f"  - {feature}: {count}")
@@ -3,16 +3,118 @@ OSM API Query Module
 Queries OpenStreetMap Overpass API for vector data within a bounding box
 """
 
+import asyncio
+from collections import Counter
+import gzip
+import hashlib
+import os
+import re
+from functools import lru_cache
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+import ijson
+import urllib3
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 import time
 
+import numpy as np
+import orjson
+
+from report_generator import PRIMARY_TAG_KEYS
+
+
+# Feature types queried when the caller does not specify any
+DEFAULT_FEATURE_TYPES = [
+    "amenity", "building", "highway", "landuse", "leisure", 
+    "natural", "shop", "tourism", "waterway", "railway",
+    "aeroway", "barrier", "boundary", "power", "public_transport"
+]
+
+# Public Overpass instances used to spread tiled queries
+OVERPASS_MIRRORS = [
+    "https://overpass-api.de/api/interpreter",
+    "https://overpass.kumi.systems/api/interpreter",
+    "https://maps.mail.ru/osm/tools/overpass/api/interpreter",
+]
+
+# Default location of the on-disk Overpass response cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "osm_poc")
+
+# Cached responses older than this many seconds are queried again
+CACHE_MAX_AGE = 24 * 60 * 60
+
+
+def build_key_regex(feature_types: List[str]) -> str:
+    """Anchored Overpass key regex matching exactly the given tag keys"""
+    # re.escape covers regex metacharacters; backslashes are doubled again
+    # because the regex sits inside an Overpass QL string literal
+    alternatives = "|".join(re.escape(key).replace("\\", "\\\\") for key in feature_types)
+    return f"^({alternatives})$"
+
+
+def node_arrays(nodes: List[Dict]) -> Dict[str, Any]:
+    """
+    Column-oriented view of parsed nodes for vectorized processing
+    
+    Returns parallel NumPy arrays for id, lat and lon (missing coordinates
+    become NaN) plus the tag dicts in the same order.
+    """
+    count = len(nodes)
+    nan = float('nan')
+    return {
+        "id": np.fromiter((node.get('id') or 0 for node in nodes), np.int64, count),
+        "lat": np.fromiter((nan if node.get('lat') is None else node['lat'] for node in nodes), np.float64, count),
+        "lon": np.fromiter((nan if node.get('lon') is None else node['lon'] for node in nodes), np.float64, count),
+        "tags": [node.get('tags') or {} for node in nodes],
+    }
+
+
+@lru_cache(maxsize=128)
+def query_template(feature_types: Tuple[str, ...], timeout: int, out: str = "geom") -> Tuple[str, str]:
+    """Overpass QL around the bbox for a feature set, as (prefix, suffix); out is the print verbosity"""
+    # ~"." matches any non-empty value, so unlike ["key"] it skips elements
+    # whose key is present with an empty value
+    prefix = f"""
+[out:json][timeout:{timeout}];
+nwr[~"{build_key_regex(list(feature_types))}"~"."]("""
+    suffix = f""");
+out {out};
+"""
+    return prefix, suffix
+
 
 class OSMQuery:
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_age: float = CACHE_MAX_AGE):
         self.overpass_url = "http://overpass-api.de/api/interpreter"
         self.timeout = 25
+        # Persistent session so repeated queries reuse keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'OSM-Pre-Seed-API/1.0',
+        })
+        # Overpass answers 429/50x under load; back off and retry those, POST included,
+        # waiting as long as its Retry-After asks and never backing off past 30s
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=1, backoff_max=30,
+                              status_forcelist=(429, 502, 503, 504),
+                              allowed_methods={"POST"},
+                              respect_retry_after_header=True),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Parsed responses are cached on disk here when set (disabled by default)
+        self.cache_dir = cache_dir
+        self.cache_max_age = cache_max_age
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self.session.close()
         
     def query_bounding_box(self, 
                           min_lat: float, 
@@ -34,50 +136,248 @@ class OSMQuery:
             Dictionary containing nodes, ways, and relations
         """
         if feature_types is None:
-            feature_types = [
-                "amenity", "building", "highway", "landuse", "leisure", 
-                "natural", "shop", "tourism", "waterway", "railway",
-                "aeroway", "barrier", "boundary", "power", "public_transport"
-            ]
-        
-        # Build the Overpass QL query
-        query_parts = []
-        for feature_type in feature_types:
-            query_parts.append(f'  nwr["{feature_type}"]({min_lat},{min_lon},{max_lat},{max_lon});')
-        
-        query = f"""
-[out:json][timeout:{self.timeout}];
-(
-{chr(10).join(query_parts)}
-);
-out geom;
-"""
+            feature_types = DEFAULT_FEATURE_TYPES
+        
+        cache_path = self._cache_path(min_lat, min_lon, max_lat, max_lon, feature_types)
+        if cache_path and self._cache_is_fresh(cache_path):
+            try:
+                with gzip.open(cache_path, 'rb') as f:
+                    result = orjson.loads(f.read())
+                print(f"Loaded {result['total_elements']} elements from cache: {cache_path}")
+                return result
+            except (OSError, orjson.JSONDecodeError) as e:
+                print(f"Warning: ignoring unreadable OSM cache {cache_path}: {e}")
+        
+        query = self._build_query(min_lat, min_lon, max_lat, max_lon, feature_types)
         
         print(f"Querying OSM for bounding box: ({min_lat}, {min_lon}) to ({max_lat}, {max_lon})")
         print(f"Feature types: {', '.join(feature_types)}")
         
         try:
-            response = requests.post(self.overpass_url, data=query, timeout=self.timeout)
-            response.raise_for_status()
+            # Stream the response and parse elements as they arrive, so the
+            # raw JSON document is never held in memory as a whole
+            with self.session.post(self.overpass_url, data=query, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                
+                remarks = []
+                events = self._collect_remarks(ijson.parse(response.raw, use_float=True), remarks)
+                result = self._parse_osm_data(ijson.items(events, 'elements.item'))
+            print(f"Retrieved {result['total_elements']} elements from OSM")
             
-            data = response.json()
-            print(f"Retrieved {len(data.get('elements', []))} elements from OSM")
+            # A remark means Overpass cut the query short (timeout, memory);
+            # neither that partial result nor an empty one is worth caching
+            if remarks:
+                print(f"Warning: Overpass remark: {remarks[0]}")
+            if cache_path and result['total_elements'] and not remarks:
+                self._write_cache(cache_path, result)
             
-            return self._parse_osm_data(data)
+            return result
             
-        except requests.exceptions.RequestException as e:
+        # Reading response.raw directly surfaces urllib3 errors (e.g. read
+        # timeouts) that requests would otherwise wrap
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ijson.JSONError) as e:
             print(f"Error querying OSM API: {e}")
             return {"nodes": [], "ways": [], "relations": [], "error": str(e)}
     
-    def _parse_osm_data(self, data: Dict[str, Any]) -> Dict[str, List[Dict]]:
-        """Parse OSM data into structured format"""
-        elements = data.get('elements', [])
+    def count_bounding_box(self,
+                           min_lat: float,
+                           min_lon: float,
+                           max_lat: float,
+                           max_lon: float,
+                           feature_types: List[str] = None) -> Dict[str, Any]:
+        """
+        Count OSM elements in a bounding box without building element dicts
+        
+        Each element is counted under its first tag (in tag order) whose key is
+        in report_generator.PRIMARY_TAG_KEYS, the same rule the text report uses.
+        Only tags are fetched (out tags), not geometry.
+        
+        Returns:
+            Dictionary with total_elements, element_types and feature_counts
+        """
+        if feature_types is None:
+            feature_types = DEFAULT_FEATURE_TYPES
+        
+        query = self._build_query(min_lat, min_lon, max_lat, max_lon, feature_types, out="tags")
+        print(f"Counting OSM elements for bounding box: ({min_lat}, {min_lon}) to ({max_lat}, {max_lon})")
+        
+        try:
+            with self.session.post(self.overpass_url, data=query, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                
+                return self._count_osm_events(ijson.parse(response.raw, use_float=True), PRIMARY_TAG_KEYS)
+            
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ijson.JSONError) as e:
+            print(f"Error querying OSM API: {e}")
+            return {"total_elements": 0, "element_types": {}, "feature_counts": {}, "error": str(e)}
+    
+    def _count_osm_events(self, events: Iterable[Tuple[str, str, Any]], feature_keys: frozenset) -> Dict[str, Any]:
+        """Count elements and primary features from a raw ijson event stream"""
+        element_types = Counter()
+        feature_counts = Counter()
+        total_elements = 0
+        counted = False
+        pending_key = None
+        
+        for prefix, event, value in events:
+            if pending_key is not None:
+                # Event right after a matching tag key is its value
+                feature_counts[f"{pending_key}={value}"] += 1
+                counted = True
+                pending_key = None
+            elif prefix == 'elements.item.tags':
+                if event == 'map_key' and not counted and value in feature_keys:
+                    pending_key = value
+            elif prefix == 'elements.item':
+                if event == 'start_map':
+                    total_elements += 1
+                    counted = False
+            elif prefix == 'elements.item.type':
+                element_types[value] += 1
+        
+        return {
+            "total_elements": total_elements,
+            "element_types": dict(element_types),
+            "feature_counts": dict(feature_counts.most_common()),
+        }
+    
+    def query_bounding_box_tiled(self,
+                                 min_lat: float,
+                                 min_lon: float,
+                                 max_lat: float,
+                                 max_lon: float,
+                                 feature_types: List[str] = None,
+                                 tiles: Tuple[int, int] = (2, 2),
+                                 mirrors: List[str] = None) -> Dict[str, Any]:
+        """
+        Query a large bounding box as a grid of tiles fetched concurrently
+        
+        Args:
+            min_lat, min_lon, max_lat, max_lon: Bounding box
+            feature_types: List of OSM feature types to query (default: common features)
+            tiles: Grid size as (rows, columns)
+            mirrors: Overpass endpoints to spread tiles over (default: OVERPASS_MIRRORS)
+            
+        Returns:
+            Dictionary containing nodes, ways, and relations, deduplicated across tiles
+        """
+        return asyncio.run(self.aquery_bounding_box_tiled(
+            min_lat, min_lon, max_lat, max_lon, feature_types, tiles, mirrors
+        ))
+    
+    async def aquery_bounding_box_tiled(self,
+                                        min_lat: float,
+                                        min_lon: float,
+                                        max_lat: float,
+                                        max_lon: float,
+                                        feature_types: List[str] = None,
+                                        tiles: Tuple[int, int] = (2, 2),
+                                        mirrors: List[str] = None) -> Dict[str, Any]:
+        """Async variant of query_bounding_box_tiled for callers already in an event loop"""
+        if feature_types is None:
+            feature_types = DEFAULT_FEATURE_TYPES
+        mirrors = mirrors or OVERPASS_MIRRORS
+        rows, cols = tiles
+        lat_step = (max_lat - min_lat) / rows
+        lon_step = (max_lon - min_lon) / cols
+        tile_boxes = [
+            (min_lat + r * lat_step, min_lon + c * lon_step,
+             min_lat + (r + 1) * lat_step, min_lon + (c + 1) * lon_step)
+            for r in range(rows) for c in range(cols)
+        ]
+        
+        print(f"Querying OSM for bounding box: ({min_lat}, {min_lon}) to ({max_lat}, {max_lon}) "
+              f"as {len(tile_boxes)} tiles over {len(mirrors)} mirrors")
         
+        # At most one in-flight request per mirror, so no instance is hammered
+        semaphores = {mirror: asyncio.Semaphore(1) for mirror in mirrors}
+        
+        async def fetch(client: httpx.AsyncClient, index: int, tile: Tuple[float, float, float, float]):
+            mirror = mirrors[index % len(mirrors)]
+            async with semaphores[mirror]:
+                response = await client.post(mirror, data={"data": self._build_query(*tile, feature_types)})
+                response.raise_for_status()
+                return orjson.loads(response.content).get('elements', [])
+        
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout + 5,
+                                         headers={'User-Agent': 'OSM-Pre-Seed-API/1.0'}) as client:
+                tasks = [asyncio.ensure_future(fetch(client, i, tile)) for i, tile in enumerate(tile_boxes)]
+                try:
+                    tile_elements = await asyncio.gather(*tasks)
+                finally:
+                    # gather leaves the other tiles running after the first
+                    # failure; cancel them and wait before the client closes
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            print(f"Error querying OSM API: {e}")
+            return {"nodes": [], "ways": [], "relations": [], "error": str(e)}
+        
+        # Elements on tile edges come back from several tiles; ids are only
+        # unique per element type
+        merged = {}
+        for elements in tile_elements:
+            for element in elements:
+                merged[(element.get('type'), element.get('id'))] = element
+        
+        result = self._parse_osm_data(merged.values())
+        print(f"Retrieved {result['total_elements']} elements from OSM")
+        return result
+    
+    def _build_query(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                     feature_types: List[str], out: str = "geom") -> str:
+        """Overpass QL for a bbox: one regex-keyed statement instead of a union per feature type"""
+        prefix, suffix = query_template(tuple(feature_types), self.timeout, out)
+        return f"{prefix}{min_lat},{min_lon},{max_lat},{max_lon}{suffix}"
+    
+    def _cache_path(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                    feature_types: List[str]) -> Optional[str]:
+        """Cache file for a bbox and feature set, or None when caching is disabled"""
+        if not self.cache_dir:
+            return None
+        key = hashlib.blake2b(
+            f"{min_lat},{min_lon},{max_lat},{max_lon}|{','.join(sorted(feature_types))}".encode()
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+    
+    def _cache_is_fresh(self, cache_path: str) -> bool:
+        """Whether a cache file exists and is younger than cache_max_age"""
+        try:
+            return time.time() - os.path.getmtime(cache_path) < self.cache_max_age
+        except OSError:
+            return False
+    
+    def _collect_remarks(self, events: Iterable[Tuple[str, str, Any]], remarks: List[str]):
+        """Pass ijson events through, appending the top-level Overpass remark to remarks"""
+        for prefix, event, value in events:
+            if prefix == 'remark':
+                remarks.append(value)
+            yield prefix, event, value
+    
+    def _write_cache(self, cache_path: str, result: Dict[str, Any]) -> None:
+        """Atomically store a parsed result; cache failures never fail the query"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(result))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: could not write OSM cache {cache_path}: {e}")
+    
+    def _parse_osm_data(self, elements: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict]]:
+        """Parse an iterable of raw Overpass elements into structured format"""
         nodes = []
         ways = []
         relations = []
+        total_elements = 0
         
         for element in elements:
+            total_elements += 1
             element_type = element.get('type')
             
             if element_type == 'node':
@@ -91,21 +391,17 @@ out geom;
             "nodes": nodes,
             "ways": ways, 
             "relations": relations,
-            "total_elements": len(elements)
+            "total_elements": total_elements
         }
     
     def _parse_node(self, node: Dict) -> Dict:
-        """Parse a node element"""
+        """Parse a node element; lat/lon already give its point, so no geometry is stored"""
         return {
             "id": node.get('id'),
             "type": "node",
             "lat": node.get('lat'),
             "lon": node.get('lon'),
-            "tags": node.get('tags', {}),
-            "geometry": {
-                "type": "Point",
-                "coordinates": [node.get('lon'), node.get('lat')]
-            }
+            "tags": node.get('tags', {})
         }
     
     def _parse_way(self, way: Dict) -> Dict:
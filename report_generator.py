@@ -3,10 +3,23 @@ Report Generator Module
 Generates text reports from OSM data
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping
 from collections import Counter, defaultdict
-import json
 from datetime import datetime
+from itertools import chain
+from types import MappingProxyType
+
+import orjson
+
+
+# Shared read-only stand-in for missing tags, so tag-less elements do not
+# allocate a fresh empty dict in every loop
+EMPTY_TAGS: Mapping[str, str] = MappingProxyType({})
+
+PRIMARY_TAG_KEYS = frozenset({
+    'amenity', 'building', 'highway', 'landuse', 'leisure',
+    'natural', 'shop', 'tourism', 'waterway', 'railway',
+})
 
 
 class OSMReportGenerator:
@@ -28,6 +41,7 @@ class OSMReportGenerator:
             Formatted report string
         """
         self.report_data = osm_data
+        stats = self._compute_all_stats()
         
         report_lines = []
         report_lines.append("=" * 80)
@@ -38,15 +52,15 @@ class OSMReportGenerator:
         report_lines.append("")
         
         # Summary statistics
-        report_lines.extend(self._generate_summary())
+        report_lines.extend(self._generate_summary(stats))
         report_lines.append("")
         
         # Feature type analysis
-        report_lines.extend(self._generate_feature_analysis())
+        report_lines.extend(self._generate_feature_analysis(stats))
         report_lines.append("")
         
         # Detailed breakdowns
-        report_lines.extend(self._generate_detailed_breakdown())
+        report_lines.extend(self._generate_detailed_breakdown(stats))
         report_lines.append("")
         
         # Sample data
@@ -61,7 +75,38 @@ class OSMReportGenerator:
         
         return report_text
     
-    def _generate_summary(self) -> List[str]:
+    def _compute_all_stats(self) -> Dict[str, Any]:
+        """Collect geometry, feature and tag counts in a single pass over the data"""
+        geometry_counts = Counter()
+        feature_counts = Counter()
+        tag_counts = {}
+        
+        nodes = self.report_data.get('nodes', [])
+        geometry_counts['Point'] = len(nodes)
+        
+        for element_type in ['nodes', 'ways', 'relations']:
+            elements = self.report_data.get(element_type, [])
+            # Tag key frequencies across all elements of this type
+            tag_counts[element_type] = Counter(
+                chain.from_iterable(element.get('tags') or EMPTY_TAGS for element in elements)
+            )
+            is_way = element_type == 'ways'
+            for element in elements:
+                if is_way and element.get('geometry'):
+                    geometry_counts[element['geometry'].get('type', 'Unknown')] += 1
+                # First meaningful tag decides the feature type
+                for tag_key, tag_value in (element.get('tags') or EMPTY_TAGS).items():
+                    if tag_key in PRIMARY_TAG_KEYS:
+                        feature_counts[f"{tag_key}={tag_value}"] += 1
+                        break
+        
+        return {
+            'geometry_types': dict(geometry_counts),
+            'feature_counts': feature_counts,
+            'tag_counts': tag_counts,
+        }
+    
+    def _generate_summary(self, stats: Dict[str, Any]) -> List[str]:
         """Generate summary statistics"""
         lines = []
         lines.append("SUMMARY STATISTICS")
@@ -79,7 +124,7 @@ class OSMReportGenerator:
         lines.append("")
         
         # Geometry type breakdown
-        geometry_types = self._count_geometry_types()
+        geometry_types = stats['geometry_types']
         if geometry_types:
             lines.append("Geometry Types:")
             for geom_type, count in geometry_types.items():
@@ -87,14 +132,14 @@ class OSMReportGenerator:
         
         return lines
     
-    def _generate_feature_analysis(self) -> List[str]:
+    def _generate_feature_analysis(self, stats: Dict[str, Any]) -> List[str]:
         """Generate feature type analysis"""
         lines = []
         lines.append("FEATURE TYPE ANALYSIS")
         lines.append("-" * 40)
         
         # Count features by primary tag
-        feature_counts = self._count_features_by_tag()
+        feature_counts = stats['feature_counts']
         
         if feature_counts:
             lines.append("Top Feature Types:")
@@ -105,17 +150,18 @@ class OSMReportGenerator:
         
         return lines
     
-    def _generate_detailed_breakdown(self) -> List[str]:
+    def _generate_detailed_breakdown(self, stats: Dict[str, Any]) -> List[str]:
         """Generate detailed breakdown by element type"""
         lines = []
         lines.append("DETAILED BREAKDOWN")
         lines.append("-" * 40)
+        tag_counts = stats['tag_counts']
         
         # Nodes breakdown
         nodes = self.report_data.get('nodes', [])
         if nodes:
             lines.append(f"NODES ({len(nodes)} total):")
-            node_tags = self._count_tags_in_elements(nodes)
+            node_tags = tag_counts['nodes']
             for tag, count in node_tags.most_common(10):
                 lines.append(f"  {tag}: {count}")
             lines.append("")
@@ -124,7 +170,7 @@ class OSMReportGenerator:
         ways = self.report_data.get('ways', [])
         if ways:
             lines.append(f"WAYS ({len(ways)} total):")
-            way_tags = self._count_tags_in_elements(ways)
+            way_tags = tag_counts['ways']
             for tag, count in way_tags.most_common(10):
                 lines.append(f"  {tag}: {count}")
             lines.append("")
@@ -133,7 +179,7 @@ class OSMReportGenerator:
         relations = self.report_data.get('relations', [])
         if relations:
             lines.append(f"RELATIONS ({len(relations)} total):")
-            relation_tags = self._count_tags_in_elements(relations)
+            relation_tags = tag_counts['relations']
             for tag, count in relation_tags.most_common(10):
                 lines.append(f"  {tag}: {count}")
         
@@ -173,58 +219,13 @@ class OSMReportGenerator:
                 lines.append("")
         
         return lines
-    
-    def _count_geometry_types(self) -> Dict[str, int]:
-        """Count geometry types in the data"""
-        geometry_counts = Counter()
-        
-        # Count from nodes (all points)
-        nodes = self.report_data.get('nodes', [])
-        geometry_counts['Point'] = len(nodes)
-        
-        # Count from ways
-        ways = self.report_data.get('ways', [])
-        for way in ways:
-            if way.get('geometry'):
-                geom_type = way['geometry'].get('type', 'Unknown')
-                geometry_counts[geom_type] += 1
-        
-        return dict(geometry_counts)
-    
-    def _count_features_by_tag(self) -> Counter:
-        """Count features by their primary tag"""
-        feature_counts = Counter()
-        
-        # Count from all elements
-        for element_type in ['nodes', 'ways', 'relations']:
-            elements = self.report_data.get(element_type, [])
-            for element in elements:
-                tags = element.get('tags', {})
-                # Get the first meaningful tag
-                for tag_key, tag_value in tags.items():
-                    if tag_key in ['amenity', 'building', 'highway', 'landuse', 'leisure', 
-                                 'natural', 'shop', 'tourism', 'waterway', 'railway']:
-                        feature_counts[f"{tag_key}={tag_value}"] += 1
-                        break
-        
-        return feature_counts
-    
-    def _count_tags_in_elements(self, elements: List[Dict]) -> Counter:
-        """Count tag occurrences in a list of elements"""
-        tag_counts = Counter()
-        
-        for element in elements:
-            tags = element.get('tags', {})
-            for tag_key in tags.keys():
-                tag_counts[tag_key] += 1
-        
-        return tag_counts
 
 
-def save_json_report(osm_data: Dict[str, List[Dict]], output_file: str):
-    """Save raw OSM data as JSON for further analysis"""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(osm_data, f, indent=2, ensure_ascii=False)
+def save_json_report(osm_data: Dict[str, List[Dict]], output_file: str, pretty: bool = False):
+    """Save raw OSM data as JSON for further analysis (compact unless pretty is set)"""
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(osm_data, option=option))
     print(f"Raw data saved to: {output_file}")
 
 
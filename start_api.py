@@ -25,13 +25,30 @@ def main():
     print("Press Ctrl+C to stop the server")
     print()
     
+    # OSM_ENV=dev keeps the single auto-reloading process; anything else
+    # runs OSM_WORKERS workers (default: one per core) on the C event loop
+    # and HTTP parser. api.py reads OSM_WORKERS too, to split the cores
+    # between the workers' rendering pools.
+    if os.environ.get("OSM_ENV") == "dev":
+        os.environ["OSM_WORKERS"] = "1"
+        server_options = {"reload": True}
+    else:
+        workers = int(os.environ.get("OSM_WORKERS") or os.cpu_count() or 1)
+        os.environ["OSM_WORKERS"] = str(workers)
+        server_options = {
+            "reload": False,
+            "workers": workers,
+            "loop": "uvloop",
+            "http": "httptools",
+        }
+    
     try:
         uvicorn.run(
             "api:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,  # Auto-reload on code changes
-            log_level="info"
+            log_level="info",
+            **server_options
         )
     except KeyboardInterrupt:
         print("\nServer stopped by user")
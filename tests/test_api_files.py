@@ -0,0 +1,28 @@
+"""
+Tests for serving session files from the API
+"""
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from api import app, OUTPUT_DIR, SESSION_DATA_FILENAME
+
+
+client = TestClient(app)
+
+
+def test_session_dotfile_is_not_served():
+    session_id = str(uuid.uuid4())
+    session_dir = OUTPUT_DIR / session_id
+    session_dir.mkdir(parents=True)
+    try:
+        (session_dir / SESSION_DATA_FILENAME).write_bytes(b"pickle")
+        (session_dir / "report.txt").write_text("report")
+        
+        assert client.get(f"/files/{session_id}/{SESSION_DATA_FILENAME}").status_code == 404
+        assert client.get(f"/files/{session_id}/report.txt").status_code == 200
+    finally:
+        for path in session_dir.iterdir():
+            path.unlink()
+        session_dir.rmdir()
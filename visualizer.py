@@ -7,14 +7,76 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.collections import LineCollection, PatchCollection
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, List, Any, Tuple
 from collections import defaultdict, Counter
+from functools import lru_cache
+from itertools import islice
 import folium
 from folium import plugins
 import json
 
+from codegen import compile_function
+from osm_query import node_arrays
+from report_generator import EMPTY_TAGS
+
+
+def has_elements(osm_data: Dict[str, List[Dict]]) -> bool:
+    """Whether osm_data holds any node, way or relation"""
+    return any(osm_data.get(key) for key in ('nodes', 'ways', 'relations'))
+
+
+@lru_cache(maxsize=None)
+def _type_title(element_type: str) -> str:
+    """Title-cased element type for popups; only a handful of distinct values"""
+    return element_type.title()
+
+
+def compile_tag_classifier(name: str, priority: Tuple[str, ...],
+                           results: Dict[str, Any], default: Any) -> Callable:
+    """
+    Generate classify(tags) returning results[key] for the first key in
+    priority present in tags, or default.
+    
+    The keys are tested as straight-line membership checks rather than a loop
+    over priority, which roughly halves the cost per call.
+    """
+    namespace = {'DEFAULT': default}
+    lines = [f"def classify_{name}(tags):"]
+    for position, key in enumerate(priority):
+        namespace[f"RESULT_{position}"] = results[key]
+        lines += [
+            f"    if {key!r} in tags:",
+            f"        return RESULT_{position}",
+        ]
+    lines.append("    return DEFAULT")
+    return compile_function(f"classify_{name}", lines, namespace, f"<tag classifier {name}>")
+
+
+def _vertices_in_view(vertices: np.ndarray, bbox: Tuple[float, float, float, float]) -> bool:
+    """Whether the extent of an N x 2 [lon, lat] vertex array overlaps bbox"""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    (way_min_lon, way_min_lat), (way_max_lon, way_max_lat) = vertices.min(axis=0), vertices.max(axis=0)
+    return (way_max_lon >= min_lon and way_min_lon <= max_lon
+            and way_max_lat >= min_lat and way_min_lat <= max_lat)
+
+
+# Matplotlib settings applied while rendering the OSM plot
+PLOT_RC_PARAMS = {'path.simplify': True, 'path.simplify_threshold': 1.0}
+
 
 class OSMVisualizer:
+    # Tag keys that decide way colors and node types, highest priority first
+    WAY_TAG_PRIORITY = ('building', 'highway', 'waterway', 'natural', 'amenity',
+                        'leisure', 'shop', 'tourism', 'landuse')
+    NODE_TAG_PRIORITY = ('amenity', 'shop', 'tourism', 'natural', 'leisure')
+    # Tags worth showing in map popups; others only fill leftover space
+    POPUP_TAG_WHITELIST = frozenset({'name', 'amenity', 'highway', 'building', 'shop',
+                                     'tourism', 'natural', 'leisure', 'waterway', 'landuse'})
+    # Node count above which the folium map clusters nodes instead of styling each
+    FAST_CLUSTER_THRESHOLD = 5000
+    # Node count above which the matplotlib plot shows a density image instead of markers
+    DENSE_NODE_THRESHOLD = 100_000
+    
     def __init__(self):
         self.colors = {
             'building': '#8B4513',
@@ -28,11 +90,27 @@ class OSMVisualizer:
             'landuse': '#90EE90',
             'default': '#808080'
         }
+        # Tag classifiers are specialized once to the fixed priorities and colors
+        self._classify_way_color = compile_tag_classifier(
+            'way_color', self.WAY_TAG_PRIORITY, self.colors, self.colors['default']
+        )
+        self._classify_node_type = compile_tag_classifier(
+            'node_type', self.NODE_TAG_PRIORITY,
+            {key: key for key in self.NODE_TAG_PRIORITY}, 'default'
+        )
+        # Legend proxies depend only on the colors, so build them once
+        self._legend_handles = [
+            plt.Line2D([0], [0], marker='o', color='w',
+                       markerfacecolor=color, markersize=8,
+                       label=feature_type.title())
+            for feature_type, color in self.colors.items()
+            if feature_type != 'default'
+        ]
     
     def create_matplotlib_plot(self, osm_data: Dict[str, List[Dict]], 
                              bbox: Tuple[float, float, float, float],
                              output_file: str = "osm_plot.png",
-                             show_plot: bool = True) -> None:
+                             show_plot: bool = True) -> bool:
         """
         Create a matplotlib visualization of OSM data
         
@@ -41,43 +119,58 @@ class OSMVisualizer:
             bbox: Bounding box (min_lat, min_lon, max_lat, max_lon)
             output_file: Output file path
             show_plot: Whether to display the plot
+            
+        Returns:
+            False, without writing output_file, when osm_data has no elements
         """
-        fig, ax = plt.subplots(1, 1, figsize=(12, 10))
-        
-        min_lat, min_lon, max_lat, max_lon = bbox
-        
-        # Set up the plot bounds
-        ax.set_xlim(min_lon, max_lon)
-        ax.set_ylim(min_lat, max_lat)
-        ax.set_aspect('equal')
-        ax.set_xlabel('Longitude')
-        ax.set_ylabel('Latitude')
-        ax.set_title('OSM Data Visualization')
-        ax.grid(True, alpha=0.3)
-        
-        # Plot ways (lines and polygons)
-        ways = osm_data.get('ways', [])
-        self._plot_ways(ax, ways)
+        if not has_elements(osm_data):
+            print("Warning: no OSM elements to plot; skipping matplotlib plot")
+            return False
         
-        # Plot nodes (points)
-        nodes = osm_data.get('nodes', [])
-        self._plot_nodes(ax, nodes)
-        
-        # Add legend
-        self._add_legend(ax)
-        
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        # Aggressive path simplification drops sub-pixel vertices from the
+        # dense way collections; scoped so other figures keep the defaults
+        with plt.rc_context(PLOT_RC_PARAMS):
+            fig, ax = plt.subplots(1, 1, figsize=(12, 10))
+            
+            min_lat, min_lon, max_lat, max_lon = bbox
+            
+            # Set up the plot bounds
+            ax.set_xlim(min_lon, max_lon)
+            ax.set_ylim(min_lat, max_lat)
+            ax.set_aspect('equal')
+            ax.set_xlabel('Longitude')
+            ax.set_ylabel('Latitude')
+            ax.set_title('OSM Data Visualization')
+            ax.grid(True, alpha=0.3)
+            
+            # Plot ways (lines and polygons)
+            ways = osm_data.get('ways', [])
+            ways_drawn = self._plot_ways(ax, ways, bbox)
+            
+            # Plot nodes (points)
+            nodes = osm_data.get('nodes', [])
+            nodes_drawn = self._plot_nodes(ax, nodes, bbox)
+            
+            # Add legend, unless nothing inside the bbox was drawn. Dense nodes are
+            # a density image with its own colorbar, so only ways need the legend
+            if nodes_drawn > self.DENSE_NODE_THRESHOLD:
+                nodes_drawn = 0
+            if ways_drawn or nodes_drawn:
+                self._add_legend(ax)
+            
+            plt.tight_layout()
+            plt.savefig(output_file, dpi=300, bbox_inches='tight')
         print(f"Matplotlib plot saved to: {output_file}")
         
         if show_plot:
             plt.show()
         else:
             plt.close()
+        return True
     
     def create_folium_map(self, osm_data: Dict[str, List[Dict]], 
                          bbox: Tuple[float, float, float, float],
-                         output_file: str = "osm_map.html") -> None:
+                         output_file: str = "osm_map.html") -> bool:
         """
         Create an interactive Folium map of OSM data
         
@@ -85,7 +178,14 @@ class OSMVisualizer:
             osm_data: Parsed OSM data
             bbox: Bounding box (min_lat, min_lon, max_lat, max_lon)
             output_file: Output HTML file path
+            
+        Returns:
+            False, without writing output_file, when osm_data has no elements
         """
+        if not has_elements(osm_data):
+            print("Warning: no OSM elements to map; skipping folium map")
+            return False
+        
         min_lat, min_lon, max_lat, max_lon = bbox
         
         # Calculate center point
@@ -108,13 +208,29 @@ class OSMVisualizer:
             popup='Query Bounding Box'
         ).add_to(m)
         
-        # Add ways
         ways = osm_data.get('ways', [])
-        self._add_ways_to_folium(m, ways)
+        nodes = [node for node in osm_data.get('nodes', [])
+                 if node.get('lat') is not None and node.get('lon') is not None]
         
-        # Add nodes
-        nodes = osm_data.get('nodes', [])
-        self._add_nodes_to_folium(m, nodes)
+        # Past a few thousand styled markers the browser stalls; cluster instead
+        if len(nodes) > self.FAST_CLUSTER_THRESHOLD:
+            plugins.FastMarkerCluster(
+                [[node['lat'], node['lon']] for node in nodes],
+                name='Nodes'
+            ).add_to(m)
+            nodes = []
+        
+        # All ways and nodes go in as one GeoJSON layer: a single JSON blob
+        # and template expansion instead of one JS object per element
+        feature_collection = self._build_geojson(ways, nodes)
+        if feature_collection['features']:
+            folium.GeoJson(
+                feature_collection,
+                name='OSM features',
+                marker=folium.CircleMarker(radius=3, fill=True),
+                style_function=self._folium_style,
+                popup=folium.GeoJsonPopup(fields=['popup'], labels=False),
+            ).add_to(m)
         
         # Add layer control
         folium.LayerControl().add_to(m)
@@ -122,9 +238,16 @@ class OSMVisualizer:
         # Save map
         m.save(output_file)
         print(f"Interactive map saved to: {output_file}")
+        return True
     
-    def _plot_ways(self, ax, ways: List[Dict]) -> None:
-        """Plot ways (lines and polygons) on matplotlib axes"""
+    def _plot_ways(self, ax, ways: List[Dict], bbox: Tuple[float, float, float, float] = None) -> int:
+        """Plot ways (lines and polygons) on matplotlib axes, skipping ways outside bbox.
+        Returns the number of ways drawn."""
+        # Lines and polygons are batched into one collection per color
+        # instead of one artist per way
+        line_segments = defaultdict(list)
+        polygon_patches = defaultdict(list)
+        
         for way in ways:
             geometry = way.get('geometry')
             if not geometry:
@@ -136,164 +259,202 @@ class OSMVisualizer:
             if not coords:
                 continue
             
+            if geom_type == 'LineString':
+                # Unresolved node references carry no coordinates to draw
+                if not isinstance(coords[0], list):
+                    continue
+                vertices = np.asarray(coords)
+            elif geom_type == 'Polygon' and len(coords[0]) > 2:
+                vertices = np.asarray(coords[0])
+            else:
+                continue
+            
+            if bbox is not None and not _vertices_in_view(vertices, bbox):
+                continue
+            
             # Get color based on tags
             color = self._get_color_for_way(way)
             
             if geom_type == 'LineString':
-                # Plot as line
-                lons, lats = zip(*coords)
-                ax.plot(lons, lats, color=color, linewidth=1, alpha=0.7)
-                
-            elif geom_type == 'Polygon':
-                # Plot as polygon
-                if coords and len(coords[0]) > 2:
-                    lons, lats = zip(*coords[0])
-                    polygon = patches.Polygon(list(zip(lons, lats)), 
-                                            facecolor=color, 
-                                            edgecolor='black',
-                                            alpha=0.5,
-                                            linewidth=0.5)
-                    ax.add_patch(polygon)
+                line_segments[color].append(vertices)
+            else:
+                polygon_patches[color].append(patches.Polygon(vertices, closed=True))
+        
+        # Dense collections are rasterized so vector outputs (PDF/SVG) keep
+        # only axes, labels and legend as paths
+        for color, polygons in polygon_patches.items():
+            ax.add_collection(PatchCollection(polygons, facecolors=color, edgecolors='black',
+                                              alpha=0.5, linewidths=0.5, match_original=False,
+                                              rasterized=True))
+        for color, segments in line_segments.items():
+            ax.add_collection(LineCollection(segments, colors=color, linewidths=1, alpha=0.7,
+                                             rasterized=True))
+        # Collections do not autoscale; keep the data limits current for
+        # callers that do not fix the axes to a bbox
+        ax.autoscale_view()
+        return (sum(len(polygons) for polygons in polygon_patches.values())
+                + sum(len(segments) for segments in line_segments.values()))
     
-    def _plot_nodes(self, ax, nodes: List[Dict]) -> None:
-        """Plot nodes (points) on matplotlib axes"""
+    def _plot_nodes(self, ax, nodes: List[Dict], bbox: Tuple[float, float, float, float] = None) -> int:
+        """Plot nodes (points) on matplotlib axes, skipping nodes outside bbox.
+        Returns the number of nodes drawn."""
         if not nodes:
-            return
+            return 0
             
-        # Group nodes by type for better visualization
-        node_types = defaultdict(list)
+        columns = node_arrays(nodes)
         
-        for node in nodes:
-            tags = node.get('tags', {})
-            node_type = self._get_node_type(tags)
-            node_types[node_type].append((node.get('lon'), node.get('lat')))
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            lons, lats = columns['lon'], columns['lat']
+            in_view = (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+            if not in_view.all():
+                columns = {
+                    "id": columns['id'][in_view],
+                    "lat": lats[in_view],
+                    "lon": lons[in_view],
+                    "tags": [tags for tags, keep in zip(columns['tags'], in_view.tolist()) if keep],
+                }
+        
+        # Beyond this many points individual markers are unreadable and slow;
+        # draw a density image over the current axes extent instead
+        if len(columns['tags']) > self.DENSE_NODE_THRESHOLD:
+            (min_lon, max_lon), (min_lat, max_lat) = ax.get_xlim(), ax.get_ylim()
+            extent = [min_lon, max_lon, min_lat, max_lat]
+            density, _, _ = np.histogram2d(columns['lon'], columns['lat'], bins=(1024, 1024),
+                                           range=[[min_lon, max_lon], [min_lat, max_lat]])
+            # Empty bins are masked so the ways underneath stay visible
+            image = ax.imshow(np.ma.masked_equal(density.T, 0), origin='lower', extent=extent,
+                              cmap='viridis', interpolation='nearest', aspect='equal')
+            ax.figure.colorbar(image, ax=ax, label='Nodes per bin')
+            return len(columns['tags'])
+        
+        if not columns['tags']:
+            return 0
+        
+        # Group nodes by type for better visualization; types are held as
+        # small integer codes so each mask is a cheap int8 comparison
+        type_names = self.NODE_TAG_PRIORITY + ('default',)
+        type_codes = {name: code for code, name in enumerate(type_names)}
+        node_type_idx = np.fromiter(
+            (type_codes[self._get_node_type(tags)] for tags in columns['tags']),
+            np.int8, len(columns['tags'])
+        )
         
-        # Plot each type with different markers
+        # Plot each type with different markers, in first-seen order
         markers = ['o', 's', '^', 'v', 'D', 'p', '*', 'h']
-        for i, (node_type, coords) in enumerate(node_types.items()):
-            if coords:
-                lons, lats = zip(*coords)
-                color = self.colors.get(node_type, self.colors['default'])
-                marker = markers[i % len(markers)]
-                ax.scatter(lons, lats, c=color, marker=marker, s=20, alpha=0.7, label=node_type)
+        present, first_seen = np.unique(node_type_idx, return_index=True)
+        for i, code in enumerate(present[np.argsort(first_seen)].tolist()):
+            node_type = type_names[code]
+            mask = node_type_idx == code
+            color = self.colors.get(node_type, self.colors['default'])
+            marker = markers[i % len(markers)]
+            ax.scatter(columns['lon'][mask], columns['lat'][mask], c=color, marker=marker, s=20, alpha=0.7, label=node_type,
+                       rasterized=True)
+        return len(columns['tags'])
     
-    def _add_ways_to_folium(self, m, ways: List[Dict]) -> None:
-        """Add ways to Folium map"""
+    def _build_geojson(self, ways: List[Dict], nodes: List[Dict]) -> Dict[str, Any]:
+        """FeatureCollection of drawable ways and nodes, with color and popup properties"""
+        features = []
+        
+        # Parsed way geometries are already GeoJSON ([lon, lat] order)
         for way in ways:
             geometry = way.get('geometry')
-            if not geometry:
-                continue
-                
-            geom_type = geometry.get('type')
-            coords = geometry.get('coordinates', [])
-            
-            if not coords:
+            if not geometry or not geometry.get('coordinates'):
                 continue
             
-            # Get color and popup info
-            color = self._get_color_for_way(way)
-            popup_text = self._create_popup_text(way)
-            
+            geom_type = geometry.get('type')
+            coords = geometry['coordinates']
             if geom_type == 'LineString':
-                # Add as polyline
-                folium.PolyLine(
-                    locations=[[lat, lon] for lon, lat in coords],
-                    color=color,
-                    weight=2,
-                    opacity=0.7,
-                    popup=popup_text
-                ).add_to(m)
-                
-            elif geom_type == 'Polygon':
-                # Add as polygon
-                if coords and len(coords[0]) > 2:
-                    folium.Polygon(
-                        locations=[[lat, lon] for lon, lat in coords[0]],
-                        color=color,
-                        weight=2,
-                        fill=True,
-                        fillColor=color,
-                        fillOpacity=0.3,
-                        popup=popup_text
-                    ).add_to(m)
-    
-    def _add_nodes_to_folium(self, m, nodes: List[Dict]) -> None:
-        """Add nodes to Folium map"""
-        for node in nodes:
-            lat = node.get('lat')
-            lon = node.get('lon')
-            tags = node.get('tags', {})
-            
-            if lat is None or lon is None:
+                # Unresolved node references carry no coordinates to draw
+                if not isinstance(coords[0], list):
+                    continue
+                kind = 'line'
+            elif geom_type == 'Polygon' and len(coords[0]) > 2:
+                kind = 'polygon'
+            else:
                 continue
             
-            # Get color and popup
-            node_type = self._get_node_type(tags)
-            color = self.colors.get(node_type, self.colors['default'])
-            popup_text = self._create_popup_text(node)
-            
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=3,
-                popup=popup_text,
-                color=color,
-                fill=True,
-                fillColor=color,
-                fillOpacity=0.7
-            ).add_to(m)
+            features.append({
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": {
+                    "kind": kind,
+                    "color": self._get_color_for_way(way),
+                    "popup": self._create_popup_text(way),
+                },
+            })
+        
+        for node in nodes:
+            node_type = self._get_node_type(node.get('tags') or {})
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [node['lon'], node['lat']]},
+                "properties": {
+                    "kind": 'node',
+                    "color": self.colors.get(node_type, self.colors['default']),
+                    "popup": self._create_popup_text(node),
+                },
+            })
+        
+        return {"type": "FeatureCollection", "features": features}
+    
+    @staticmethod
+    def _folium_style(feature: Dict) -> Dict[str, Any]:
+        """Leaflet path style for a feature from _build_geojson"""
+        properties = feature['properties']
+        color = properties['color']
+        kind = properties['kind']
+        if kind == 'line':
+            return {"color": color, "weight": 2, "opacity": 0.7}
+        if kind == 'polygon':
+            return {"color": color, "weight": 2, "fillColor": color, "fillOpacity": 0.3}
+        return {"color": color, "fillColor": color, "fillOpacity": 0.7}
     
     def _get_color_for_way(self, way: Dict) -> str:
         """Get color for a way based on its tags"""
-        tags = way.get('tags', {})
-        
-        # Check for specific feature types
-        for tag_key in ['building', 'highway', 'waterway', 'natural', 'amenity', 
-                       'leisure', 'shop', 'tourism', 'landuse']:
-            if tag_key in tags:
-                return self.colors.get(tag_key, self.colors['default'])
-        
-        return self.colors['default']
+        return self._classify_way_color(way.get('tags') or EMPTY_TAGS)
     
     def _get_node_type(self, tags: Dict) -> str:
         """Get node type based on tags"""
-        for tag_key in ['amenity', 'shop', 'tourism', 'natural', 'leisure']:
-            if tag_key in tags:
-                return tag_key
-        return 'default'
+        return self._classify_node_type(tags or EMPTY_TAGS)
     
     def _create_popup_text(self, element: Dict) -> str:
         """Create popup text for an element"""
-        element_id = element.get('id', 'Unknown')
-        element_type = element.get('type', 'Unknown')
-        tags = element.get('tags', {})
-        
-        popup = f"<b>{element_type.title()} {element_id}</b><br>"
+        parts = [f"<b>{_type_title(element.get('type', 'Unknown'))} {element.get('id', 'Unknown')}</b><br>"]
+        tags = element.get('tags') or {}
         
         if tags:
-            popup += "<br>Tags:<br>"
-            for key, value in list(tags.items())[:5]:  # Show first 5 tags
-                popup += f"• {key}: {value}<br>"
-            if len(tags) > 5:
-                popup += f"... and {len(tags) - 5} more"
+            parts.append("<br>Tags:<br>")
+            # Show up to 5 tags: whitelisted ones first, then at most 2 others
+            whitelisted = [(key, value) for key, value in tags.items() if key in self.POPUP_TAG_WHITELIST]
+            shown = whitelisted[:5]
+            if len(shown) < 5:
+                others = ((key, value) for key, value in tags.items() if key not in self.POPUP_TAG_WHITELIST)
+                shown.extend(islice(others, min(2, 5 - len(shown))))
+            parts.extend(f"• {key}: {value}<br>" for key, value in shown)
+            if len(tags) > len(shown):
+                parts.append(f"... and {len(tags) - len(shown)} more")
         else:
-            popup += "No tags"
+            parts.append("No tags")
         
-        return popup
+        return "".join(parts)
     
     def _add_legend(self, ax) -> None:
         """Add legend to matplotlib plot"""
-        legend_elements = []
-        for feature_type, color in self.colors.items():
-            if feature_type != 'default':
-                legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', 
-                                                markerfacecolor=color, markersize=8, 
-                                                label=feature_type.title()))
-        
-        ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1, 1))
+        ax.legend(handles=self._legend_handles, loc='upper right', bbox_to_anchor=(1, 1))
+
+
+# Feature keys for the summary's top-features chart, in priority order
+SUMMARY_TAG_PRIORITY = ('amenity', 'building', 'highway', 'landuse', 'leisure',
+                        'natural', 'shop', 'tourism', 'waterway')
 
 
-def create_summary_plots(osm_data: Dict[str, List[Dict]], output_dir: str = ".") -> None:
-    """Create summary plots showing data distribution"""
+def create_summary_plots(osm_data: Dict[str, List[Dict]], output_dir: str = ".") -> bool:
+    """Create summary plots showing data distribution; False (nothing written) when osm_data is empty"""
+    if not has_elements(osm_data):
+        print("Warning: no OSM elements to summarize; skipping summary plots")
+        return False
+    
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
     
     # Plot 1: Element type distribution
@@ -304,25 +465,31 @@ def create_summary_plots(osm_data: Dict[str, List[Dict]], output_dir: str = ".")
         len(osm_data.get('relations', []))
     ]
     
-    ax1.bar(element_types, element_counts, color=['blue', 'green', 'red'])
+    # Numeric bar positions with explicit tick labels skip matplotlib's
+    # categorical axis machinery
+    ax1.bar(np.arange(len(element_types)), element_counts, color=['blue', 'green', 'red'])
+    ax1.set_xticks(np.arange(len(element_types)))
+    ax1.set_xticklabels(element_types)
     ax1.set_title('Element Type Distribution')
     ax1.set_ylabel('Count')
     
-    # Plot 2: Feature type distribution (top 10)
-    feature_counts = {}
-    for element_type in ['nodes', 'ways', 'relations']:
-        elements = osm_data.get(element_type, [])
-        for element in elements:
-            tags = element.get('tags', {})
-            for tag_key in ['amenity', 'building', 'highway', 'landuse', 'leisure', 
-                           'natural', 'shop', 'tourism', 'waterway']:
+    # Plot 2: Feature type distribution (top 10); the same pass counts
+    # tagged elements for plot 4
+    feature_counts = Counter()
+    tagged_elements = 0
+    for element_type in ('nodes', 'ways', 'relations'):
+        for element in osm_data.get(element_type, ()):
+            tags = element.get('tags')
+            if not tags:
+                continue
+            tagged_elements += 1
+            for tag_key in SUMMARY_TAG_PRIORITY:
                 if tag_key in tags:
-                    feature_type = f"{tag_key}={tags[tag_key]}"
-                    feature_counts[feature_type] = feature_counts.get(feature_type, 0) + 1
+                    feature_counts[f"{tag_key}={tags[tag_key]}"] += 1
                     break
     
     if feature_counts:
-        top_features = sorted(feature_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_features = feature_counts.most_common(10)
         features, counts = zip(*top_features)
         ax2.barh(range(len(features)), counts)
         ax2.set_yticks(range(len(features)))
@@ -338,30 +505,42 @@ def create_summary_plots(osm_data: Dict[str, List[Dict]], output_dir: str = ".")
             geom_type = way['geometry'].get('type', 'Unknown')
             geometry_counts[geom_type] = geometry_counts.get(geom_type, 0) + 1
     
-    if geometry_counts:
-        ax3.pie(geometry_counts.values(), labels=geometry_counts.keys(), autopct='%1.1f%%')
+    total_geometries = sum(geometry_counts.values())
+    if total_geometries:
+        # Ordered bars with percentage labels instead of one wedge path per slice
+        geometry_types = list(geometry_counts)
+        geometry_values = np.array(list(geometry_counts.values()))
+        percentages = 100 * geometry_values / total_geometries
+        ax3.barh(np.arange(len(geometry_types)), geometry_values)
+        ax3.set_yticks(np.arange(len(geometry_types)))
+        ax3.set_yticklabels([f"{geom_type} ({pct:.1f}%)" for geom_type, pct in zip(geometry_types, percentages)])
         ax3.set_title('Geometry Type Distribution')
+        ax3.set_xlabel('Count')
     
     # Plot 4: Data quality metrics
     total_elements = sum(element_counts)
-    tagged_elements = 0
-    for element_type in ['nodes', 'ways', 'relations']:
-        elements = osm_data.get(element_type, [])
-        tagged_elements += sum(1 for elem in elements if elem.get('tags'))
     
     quality_metrics = {
         'Tagged Elements': tagged_elements,
         'Untagged Elements': total_elements - tagged_elements
     }
     
-    ax4.bar(quality_metrics.keys(), quality_metrics.values(), color=['green', 'orange'])
+    ax4.bar(np.arange(len(quality_metrics)), list(quality_metrics.values()), color=['green', 'orange'])
+    ax4.set_xticks(np.arange(len(quality_metrics)))
+    ax4.set_xticklabels(list(quality_metrics.keys()))
     ax4.set_title('Data Quality: Tagged vs Untagged')
     ax4.set_ylabel('Count')
     
+    # The bar charts need no top/right frame
+    for ax in (ax1, ax2, ax3, ax4):
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    
     plt.tight_layout()
     plt.savefig(f"{output_dir}/osm_summary.png", dpi=300, bbox_inches='tight')
     print(f"Summary plots saved to: {output_dir}/osm_summary.png")
     plt.show()
+    return True
 
 
 if __name__ == "__main__":